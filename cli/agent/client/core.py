@@ -14,6 +14,10 @@ from .session import get_cached_session_id
 
 LOCAL_PATH_PARAMS = frozenset({'local_path', 'local'})
 
+# Recent liveness probes per agent port: port -> (monotonic time, running).
+_PROBE_TTL = 0.5
+_PROBE_CACHE: Dict[int, tuple[float, bool]] = {}
+
 
 class AgentClient:    
     TIMEOUT = 5.0
@@ -147,11 +151,19 @@ class AgentClient:
                 except socket.timeout:
                     if attempt < max_attempts - 1:
                         continue
+                    _PROBE_CACHE.pop(self.agent_port, None)
                     raise RuntimeError(f"Agent timeout after {max_attempts} attempts")
+                except ConnectionError:
+                    _PROBE_CACHE.pop(self.agent_port, None)
+                    raise
 
             if not response:
+                _PROBE_CACHE.pop(self.agent_port, None)
                 raise RuntimeError("No response from agent")
 
+            # A real response proves liveness; later probes within the TTL can skip the ping.
+            _PROBE_CACHE[self.agent_port] = (time.monotonic(), True)
+
             error = response.get('error', '')
 
             if error and 'is busy. Another command' in error and time.time() < busy_deadline:
@@ -429,16 +441,24 @@ class AgentClient:
         self.disconnect()
 
     @staticmethod
-    def is_agent_running(port: int = None, timeout: float = 0.2) -> bool:
+    def is_agent_running(port: int = None, timeout: float = 0.2, fresh: bool = False) -> bool:
+        key = port or DEFAULT_AGENT_PORT
+        if not fresh:
+            entry = _PROBE_CACHE.get(key)
+            if entry is not None and time.monotonic() - entry[0] < _PROBE_TTL:
+                return entry[1]
+
         try:
             client = AgentClient(port=port)
-            return client.ping(timeout=timeout)
+            running = client.ping(timeout=timeout)
         except Exception:
-            return False
+            running = False
+        _PROBE_CACHE[key] = (time.monotonic(), running)
+        return running
 
     @staticmethod
     def start_agent(port: int = None, background: bool = True) -> bool:
-        if AgentClient.is_agent_running(port=port):
+        if AgentClient.is_agent_running(port=port, fresh=True):
             return False
 
         import subprocess
@@ -507,7 +527,7 @@ class AgentClient:
                     if detail:
                         msg += f"\n{detail}"
                     raise RuntimeError(msg)
-                if AgentClient.is_agent_running(port=port, timeout=0.1):
+                if AgentClient.is_agent_running(port=port, timeout=0.1, fresh=True):
                     return True
         finally:
             if stderr_path:
@@ -520,7 +540,7 @@ class AgentClient:
 
     @staticmethod
     def stop_agent(port: int = None, timeout: float = 0.7) -> bool:
-        if not AgentClient.is_agent_running(port=port, timeout=0.1):
+        if not AgentClient.is_agent_running(port=port, timeout=0.1, fresh=True):
             return False
 
         try:
@@ -532,7 +552,7 @@ class AgentClient:
         start_time = time.time()
         while time.time() - start_time < timeout:
             time.sleep(0.05) 
-            if not AgentClient.is_agent_running(port=port, timeout=0.05):
+            if not AgentClient.is_agent_running(port=port, timeout=0.05, fresh=True):
                 return True
 
-        return not AgentClient.is_agent_running(port=port, timeout=0.05)
+        return not AgentClient.is_agent_running(port=port, timeout=0.05, fresh=True)
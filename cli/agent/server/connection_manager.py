@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List, Tuple
 
 from replx.protocol import ReplProtocol, create_storage
+from replx.terminal import IS_WINDOWS
 from replx.utils import parse_device_banner, canon_port as _shared_canon_port
 from replx.utils.constants import CTRL_B, CTRL_C
 from replx.utils.exceptions import TransportError
@@ -319,10 +320,6 @@ class ConnectionManager:
     def default_port(self, value: Optional[str]):
         self._default_port = self._canon_port(value) if value else None
 
-    @staticmethod
-    def _is_windows() -> bool:
-        return sys.platform == "win32" or sys.platform.startswith("win")
-
     @staticmethod
     def _canon_port(port: Optional[str]) -> Optional[str]:
         return _shared_canon_port(port)
@@ -333,7 +330,7 @@ class ConnectionManager:
         p = self._canon_port(port)
         if p in self._connections:
             return p
-        if self._is_windows() and p and re.match(r"(?i)^com\d+$", p):
+        if IS_WINDOWS and p and re.match(r"(?i)^com\d+$", p):
             needle = p.lower()
             for k in self._connections.keys():
                 if isinstance(k, str) and k.lower() == needle:
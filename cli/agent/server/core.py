@@ -686,7 +686,7 @@ class AgentServer(
             'mv': (self._cmd_mv, True),
             'df': (self._cmd_df, False),
             'touch': (self._cmd_touch, True),
-            'format': (self._cmd_format, False),
+            'format': (self._cmd_format, True),
             'get_file': (self._cmd_get_file, True),
             'get_to_local': (self._cmd_get_to_local, True),
             'put_file': (self._cmd_put_file, True),
@@ -700,6 +700,7 @@ class AgentServer(
             'repl_write': (self._cmd_repl_write, True),
             'repl_read': (self._cmd_repl_read, False),
             'session_info': (lambda ctx: self._get_session_info(), False),
+            'session_status': (self._cmd_session_status, False),
             'session_setup': (self._cmd_session_setup, True),
             'session_disconnect': (self._cmd_session_disconnect, True),
             'session_switch_fg': (self._cmd_session_switch_fg, False),
@@ -1,4 +1,5 @@
 import posixpath
+import time
 
 from replx.utils.constants import MAX_PAYLOAD_SIZE
 from replx.utils.exceptions import TransportError, FileSystemError
@@ -366,16 +367,54 @@ class FilesystemCommandsMixin:
         except Exception as e:
             raise RuntimeError(f"df failed: {e}")
 
-    def _cmd_format(self, ctx: CommandContext) -> dict:
+    def _cmd_format(self, ctx: CommandContext, reconnect_after: bool = False) -> dict:
         conn = ctx.connection
         if not conn or not conn.file_system:
             raise RuntimeError("Not connected")
 
         try:
             result = conn.file_system.format()
-            return {"formatted": result}
         except TransportError as e:
             raise DisconnectedError(f"Serial port disconnected: {e}")
         except Exception as e:
             import traceback
             raise RuntimeError(f"format failed: {e}\n{traceback.format_exc()}")
+
+        response = {"formatted": result}
+        if result and reconnect_after:
+            response.update(self._reconnect_after_format(ctx, conn))
+        return response
+
+    def _reconnect_after_format(self, ctx: CommandContext, conn, timeout: float = 1.0) -> dict:
+        # Wait until the freshly formatted filesystem answers, not a fixed delay.
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                conn.file_system.is_dir(conn.device_root_fs or "/")
+                break
+            except Exception:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.1)
+
+        port = conn.port
+        session = self._get_session(ctx.ppid) if ctx.ppid else None
+        # Keep the port's current foreground/background role in the caller's session.
+        if session and session.foreground:
+            as_foreground = session.foreground == port
+        else:
+            as_foreground = not (session and port in session.backgrounds)
+
+        # Reopen the port so the new connection sees the board as it is after the format.
+        self.connection_manager.disconnect(port)
+        try:
+            resp = self._cmd_session_setup(ctx, port=port, core=conn.core,
+                                           device=conn.device, as_foreground=as_foreground)
+        except Exception:
+            self.session_manager.remove_connection_from_all_sessions(port)
+            return {"reconnected": False}
+        return {
+            "reconnected": bool(resp.get('connected')),
+            "device": resp.get('device'),
+            "core": resp.get('core'),
+        }
@@ -209,3 +209,8 @@ class SessionCommandsMixin:
 
         self._cmd_shutdown(ctx)
         return {"released": True, "port": ""}
+
+    def _cmd_session_status(self, ctx: CommandContext) -> dict:
+        result = self._get_session_info()
+        result['status'] = self._cmd_status(ctx)
+        return result
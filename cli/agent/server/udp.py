@@ -11,6 +11,7 @@ LOOP_COMMANDS: frozenset[str] = frozenset({
     'ping',
     'status',
     'session_info',
+    'session_status',
 })
 
 FAST_COMMANDS: frozenset[str] = frozenset({
@@ -26,7 +26,7 @@ from ..config import (
     _get_global_options, AgentPortManager
 )
 from ..connection import (
-    _ensure_connected, _create_agent_client
+    _ensure_connected, _invalidate_ensured, _create_agent_client
 )
 
 from ..app import app
@@ -551,6 +551,7 @@ Run this once per project folder to set up your workspace.
                                 local_default=port,
                                 timeout=10.0
                             )
+                        _invalidate_ensured()
                         
                         STATE.core = result.get('core', '')
                         STATE.device = result.get('device', 'unknown')
@@ -637,6 +638,7 @@ Run this once per project folder to set up your workspace.
                                         port=port,
                                         as_foreground=True,
                                         local_default=port)
+        _invalidate_ensured()
         
         STATE.core = result.get('core', '')
         STATE.device = result.get('device', 'unknown')
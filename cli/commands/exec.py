@@ -25,7 +25,7 @@ from ..helpers import (
 )
 from ..config import STATE, ConfigManager
 from ..connection import (
-    _ensure_connected, _create_agent_client,
+    _ensure_connected, _invalidate_ensured, _create_agent_client,
     _get_current_agent_port, _get_global_options,
 )
 
@@ -1687,6 +1687,7 @@ Use familiar commands (ls, cd, cat, etc.) without typing "replx" each time.
             _result = _AgentClient(port=_agent_port).send_command(
                 'session_switch_fg', port=_explicit_port, timeout=3.0
             )
+            _invalidate_ensured()
             if not (_result and _result.get('success')):
                 _err = (_result or {}).get('error', 'Unknown error')
                 OutputHelper.print_panel(
@@ -2812,6 +2813,7 @@ def _reset_hard(device: str, status: dict):
             
             if not reconnected:
                 try:
+                    _invalidate_ensured()
                     _ensure_connected()
                     reconnected = True
                 except Exception:
@@ -9,7 +9,6 @@ from typing import Optional
 
 import typer
 from rich.panel import Panel
-from rich.live import Live
 
 from replx.utils.exceptions import ProtocolError
 from ..helpers import OutputHelper, get_panel_box, CONSOLE_WIDTH
@@ -182,7 +181,7 @@ Download files or directories from the device to your computer.
                 def progress_callback(progress_data):
                     progress_state.update(progress_data)
                 
-                with Live(OutputHelper.create_progress_panel(0, 1, title=f"Downloading {basename}", message="Scanning directory..."), console=OutputHelper._console, refresh_per_second=10) as live:
+                with OutputHelper.live_context(OutputHelper.create_progress_panel(0, 1, title=f"Downloading {basename}", message="Scanning directory...")) as live:
                     result_holder = {"result": None, "error": None, "done": False}
                     
                     def stream_callback(data):
@@ -232,7 +231,7 @@ Download files or directories from the device to your computer.
                         raise Exception(result_holder["error"])
             else:
                 file_count = 1
-                with Live(OutputHelper.create_progress_panel(0, file_count, title=f"Downloading {basename}", message="Downloading file..."), console=OutputHelper._console, refresh_per_second=10) as live:
+                with OutputHelper.live_context(OutputHelper.create_progress_panel(0, file_count, title=f"Downloading {basename}", message="Downloading file...")) as live:
                     result = client.send_command('get_to_local', remote_path=remote, local_path=local_path, timeout=60)
                     live.update(OutputHelper.create_progress_panel(1, 1, title=f"Downloading {basename}"))
             
@@ -259,7 +258,7 @@ Download files or directories from the device to your computer.
             )
             raise typer.Exit(1)
         
-        with Live(OutputHelper.create_progress_panel(0, total_files, title=f"Downloading {total_files} item(s)", message="Starting..."), console=OutputHelper._console, refresh_per_second=10) as live:
+        with OutputHelper.live_context(OutputHelper.create_progress_panel(0, total_files, title=f"Downloading {total_files} item(s)", message="Starting...")) as live:
             for idx, (remote, basename, is_dir) in enumerate(files_to_download):
                 display_remote = remote.replace(device_root_fs, "", 1)
                 live.update(OutputHelper.create_progress_panel(idx, total_files, title=f"Downloading {total_files} item(s)", message=f"Downloading {display_remote}..."))
@@ -1843,16 +1842,16 @@ Upload files or directories from your computer to the device.
             return
 
         parts = [p for p in normalized.split('/') if p]
-        current = ''
-        for part in parts:
-            current += '/' + part
-            try:
-                client.send_command('mkdir', path=current)
-            except Exception as e:
-                error_msg = str(e)
-                if 'EEXIST' in error_msg or 'exists' in error_msg.lower():
-                    continue
-                raise
+        if not parts:
+            return
+        # Device-side mkdir creates missing parents, so one request covers the whole tree.
+        try:
+            client.send_command('mkdir', path='/' + '/'.join(parts))
+        except Exception as e:
+            error_msg = str(e)
+            if 'EEXIST' in error_msg or 'exists' in error_msg.lower():
+                return
+            raise
     
     try:
         result = client.send_command('is_dir', path=remote)
@@ -1893,7 +1892,7 @@ Upload files or directories from your computer to the device.
             progress_state["file"] = data.get("file", base_name)
         
         try:
-            with Live(OutputHelper.create_progress_panel(0, file_count, title=f"Uploading {base_name}", message=f"Uploading {item_type.lower()}..."), console=OutputHelper._console, refresh_per_second=10) as live:
+            with OutputHelper.live_context(OutputHelper.create_progress_panel(0, file_count, title=f"Uploading {base_name}", message=f"Uploading {item_type.lower()}...")) as live:
                 upload_error = [None]
                 upload_result = [None]
                 
@@ -2003,7 +2002,7 @@ Upload files or directories from your computer to the device.
             current_file_progress["total"] = data.get("total", 0)
             current_file_progress["bytes"] = data.get("bytes", 0)
         
-        with Live(OutputHelper.create_progress_panel(0, max(total_bytes, 1), title=f"Uploading {total_files} item(s)", message="Starting..."), console=OutputHelper._console, refresh_per_second=10) as live:
+        with OutputHelper.live_context(OutputHelper.create_progress_panel(0, max(total_bytes, 1), title=f"Uploading {total_files} item(s)", message="Starting...")) as live:
             for idx, local in enumerate(files_to_upload):
                 base_name = os.path.basename(local)
                 is_dir = os.path.isdir(local)
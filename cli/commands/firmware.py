@@ -18,7 +18,7 @@ from ..helpers import (
     get_panel_box, CONSOLE_WIDTH
 )
 from ..connection import (
-    _ensure_connected, _create_agent_client
+    _ensure_connected, _invalidate_ensured, _create_agent_client
 )
 
 from ..app import app
@@ -684,6 +684,7 @@ def _firmware_update(force: bool = False):
         
         if not reconnected:
             try:
+                _invalidate_ensured()
                 _ensure_connected()
                 with _create_agent_client() as client:
                     new_status = client.send_command('status', timeout=2.0)
@@ -481,13 +481,17 @@ def _collect_install_files(
 
 def _ensure_remote_dirs(paths: set[str], client) -> None:
     all_paths: set[str] = set()
+    parents: set[str] = set()
     for path in paths:
         parts = [p for p in path.replace("\\", "/").strip("/").split("/") if p]
         cur = ""
         for p in parts:
+            if cur:
+                parents.add(cur)
             cur = f"{cur}/{p}"
             all_paths.add(cur)
-    for p in sorted(all_paths):
+    # Device-side mkdir creates missing parents, so only the deepest directories need a request.
+    for p in sorted(all_paths - parents):
         try:
             client.send_command('mkdir', path=p)
         except Exception:
@@ -1,5 +1,6 @@
 import os
 import glob
+import stat
 import time
 import threading
 import urllib.error
@@ -9,6 +10,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import typer
 from rich.panel import Panel
 from rich.live import Live
+from rich.spinner import Spinner
 
 from ..helpers import (
     OutputHelper, StoreManager, InstallHelper, SearchHelper, RegistryHelper,
@@ -212,12 +214,12 @@ def _pkg_search(args: list[str], owner: str, repo: str, ref: str):
             rver = RegistryHelper.get_version(pkg_meta)
             source = pkg_meta.get("source", "")
             lver, missing = local_ver(source, core_name, "core")
-            stat = status_label(rver, lver, missing)
+            row_stat = status_label(rver, lver, missing)
             pkg_name = pkg_meta.get("source", "").split("/")[-1].replace(".py", "")
             display_path = f"src/{relpath}"
             if relpath.endswith("/__init__.py"):
                 display_path = display_path.replace("/__init__.py", "/")
-            rows.append(("core", core_name, stat, f"{rver:.1f}", display_path, pkg_name))
+            rows.append(("core", core_name, row_stat, f"{rver:.1f}", display_path, pkg_name))
 
     def add_device_rows(dev_name: str, rows: list):
         for relpath, pkg_meta in RegistryHelper.walk_files_for_device(remote, dev_name, "src", include_submodules=True):
@@ -226,7 +228,7 @@ def _pkg_search(args: list[str], owner: str, repo: str, ref: str):
             rver = RegistryHelper.get_version(pkg_meta)
             source = pkg_meta.get("_parent_source") or pkg_meta.get("source", "")
             lver, missing = local_ver(source, dev_name, "device")
-            stat = status_label(rver, lver, missing)
+            row_stat = status_label(rver, lver, missing)
             pkg_name = pkg_meta.get("source", "").split("/")[-1].replace(".py", "")
             display_path = f"src/{relpath}"
             if relpath.endswith("/__init__.py"):
@@ -236,7 +238,7 @@ def _pkg_search(args: list[str], owner: str, repo: str, ref: str):
                 if len(src_parts) >= 2 and src_parts[0] == "device":
                     pkg_folder = src_parts[1].lstrip("_")
                     display_path = f"src/{pkg_folder}/"
-            rows.append(("device", dev_name, stat, f"{rver:.1f}", display_path, pkg_name))
+            rows.append(("device", dev_name, row_stat, f"{rver:.1f}", display_path, pkg_name))
 
     def resolve_current_dev_core() -> tuple[Optional[str], Optional[str]]:
         if not status or not status.get('connected'):
@@ -276,9 +278,9 @@ def _pkg_search(args: list[str], owner: str, repo: str, ref: str):
                 if cur_dev_key and cur_dev_key != cur_core_key:
                     add_device_rows(cur_dev_key, temp_rows)
             
-            for scope, target, stat, ver_str, shown_path, pkg_name in temp_rows:
+            for scope, target, row_stat, ver_str, shown_path, pkg_name in temp_rows:
                 if (q in pkg_name.lower()) or (q in shown_path.lower()):
-                    rows.append((scope, target, stat, ver_str, shown_path, pkg_name))
+                    rows.append((scope, target, row_stat, ver_str, shown_path, pkg_name))
     else:
         if cur_core_key:
             add_core_rows(cur_core_key, rows)
@@ -302,10 +304,10 @@ def _pkg_search(args: list[str], owner: str, repo: str, ref: str):
     w1 = max(5, max(len(r[0]) for r in rows))
     w2 = max(6, max(len(r[1]) for r in rows))
 
-    def _stat_display(stat: str) -> str:
-        if stat == "NEW":
+    def _stat_display(row_stat: str) -> str:
+        if row_stat == "NEW":
             return STAT_ICON_NEW
-        if stat == "UPD":
+        if row_stat == "UPD":
             return STAT_ICON_UPD
         return ""
 
@@ -323,30 +325,30 @@ def _pkg_search(args: list[str], owner: str, repo: str, ref: str):
             return f"[bright_yellow]{padded}[/bright_yellow]"
         return padded
 
-    def _color_stat(padded: str, stat: str) -> str:
-        if stat == "NEW":
+    def _color_stat(padded: str, row_stat: str) -> str:
+        if row_stat == "NEW":
             return f"[bright_yellow]{padded}[/bright_yellow]"
-        if stat == "UPD":
+        if row_stat == "UPD":
             return f"[cyan]{padded}[/cyan]"
         return padded
 
-    def _color_file(padded: str, stat: str) -> str:
-        if stat in ("NEW", "UPD"):
+    def _color_file(padded: str, row_stat: str) -> str:
+        if row_stat in ("NEW", "UPD"):
             return padded
         return f"[dim]{padded}[/dim]"
 
-    for scope, target, stat, ver_str, shown_path, _pkg_name in rows:
+    for scope, target, row_stat, ver_str, shown_path, _pkg_name in rows:
         scope_cell = scope.ljust(w1)
         target_cell = _color_target(scope, target.ljust(w2))
 
-        stat_shown = _stat_display(stat)
+        stat_shown = _stat_display(row_stat)
         stat_cell_raw = stat_shown.ljust(w3)
-        stat_cell = _color_stat(stat_cell_raw, stat)
+        stat_cell = _color_stat(stat_cell_raw, row_stat)
 
         ver_cell = ver_str.ljust(w4)
 
         file_plain = shown_path[4:]
-        file_cell = _color_file(file_plain, stat)
+        file_cell = _color_file(file_plain, row_stat)
 
         lines.append(f"{scope_cell}   {target_cell}   {stat_cell}   {ver_cell}  {file_cell}")
 
@@ -447,7 +449,6 @@ def _pkg_download(args: list[str], owner: str, repo: str, ref: str,
 
     def _plan_for_core(core_name: str, part: str) -> list[tuple[str, dict, str, str, dict, str]]:
         todo = []
-        remote_packages = remote.get("packages", {})
         
         for relpath, pkg_meta in RegistryHelper.walk_files_for_core(remote, core_name, part):
             if not relpath.endswith(exts):
@@ -456,23 +457,7 @@ def _pkg_download(args: list[str], owner: str, repo: str, ref: str,
             source = pkg_meta.get("source", "")
             rver = RegistryHelper.get_version(pkg_meta)
             
-            orig_pkg_name = None
-            orig_pkg_meta = None
-            
-            for name, meta in remote_packages.items():
-                if meta.get("source") == source:
-                    orig_pkg_name = name
-                    orig_pkg_meta = meta
-                    break
-                variants = meta.get("variants", {})
-                for var_name, var_meta in variants.items():
-                    if var_meta.get("source") == source:
-                        orig_pkg_name = name
-                        orig_pkg_meta = meta.copy()
-                        orig_pkg_meta["source"] = source
-                        break
-                if orig_pkg_name:
-                    break
+            orig_pkg_name, orig_pkg_meta = RegistryHelper.find_package_by_source(remote, source)
             
             if not orig_pkg_name or not orig_pkg_meta:
                 pkg_name = source.split("/")[-1].replace(".py", "").replace(".pyi", "").replace("__init__", "")
@@ -505,7 +490,6 @@ def _pkg_download(args: list[str], owner: str, repo: str, ref: str,
 
     def _plan_for_device(device_name: str, part: str) -> list[tuple[str, dict, str, str, dict, str]]:
         todo = []
-        remote_packages = remote.get("packages", {})
         
         for relpath, pkg_meta in RegistryHelper.walk_files_for_device(remote, device_name, part):
             if not relpath.endswith(exts):
@@ -514,23 +498,7 @@ def _pkg_download(args: list[str], owner: str, repo: str, ref: str,
             source = pkg_meta.get("source", "")
             rver = RegistryHelper.get_version(pkg_meta)
             
-            orig_pkg_name = None
-            orig_pkg_meta = None
-            
-            for name, meta in remote_packages.items():
-                if meta.get("source") == source:
-                    orig_pkg_name = name
-                    orig_pkg_meta = meta
-                    break
-                variants = meta.get("variants", {})
-                for var_name, var_meta in variants.items():
-                    if var_meta.get("source") == source:
-                        orig_pkg_name = name
-                        orig_pkg_meta = meta.copy()
-                        orig_pkg_meta["source"] = source
-                        break
-                if orig_pkg_name:
-                    break
+            orig_pkg_name, orig_pkg_meta = RegistryHelper.find_package_by_source(remote, source)
             
             if not orig_pkg_name or not orig_pkg_meta:
                 pkg_name = source.split("/")[-1].replace(".py", "").replace(".pyi", "").replace("__init__", "")
@@ -683,31 +651,34 @@ def _pkg_download(args: list[str], owner: str, repo: str, ref: str,
             except Exception as e:
                 return (False, relpath, str(e))
         
-        default_workers = 4
+        default_workers = 8
         max_workers = min(
             int(os.environ.get("REPLX_DOWNLOAD_THREADS", str(default_workers))),
             total,
             8
         )
         
-        with Live(OutputHelper.create_progress_panel(done, total, title=f"Downloading {download_target}", message=f"Downloading {total} file(s)..."), console=OutputHelper._console, refresh_per_second=10) as live:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_task = {executor.submit(download_file, task): task for task in plan}
-                
-                for future in as_completed(future_to_task):
-                    success, relpath, error = future.result()
+        with OutputHelper.live_context(OutputHelper.create_progress_panel(done, total, title=f"Downloading {download_target}", message=f"Downloading {total} file(s)...")) as live:
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    future_to_task = {executor.submit(download_file, task): task for task in plan}
                     
-                    with done_lock:
-                        done += 1
+                    for future in as_completed(future_to_task):
+                        success, relpath, error = future.result()
                         
-                        if not success:
-                            errors.append(f"{relpath}: {error}")
-                        
-                        live.update(OutputHelper.create_progress_panel(
-                            done, total, 
-                            title=f"Downloading {download_target}", 
-                            message=f"Downloading... {relpath} ({done}/{total})"
-                        ))
+                        with done_lock:
+                            done += 1
+                            
+                            if not success:
+                                errors.append(f"{relpath}: {error}")
+                            
+                            live.update(OutputHelper.create_progress_panel(
+                                done, total, 
+                                title=f"Downloading {download_target}", 
+                                message=f"Downloading... {relpath} ({done}/{total})"
+                            ))
+            finally:
+                InstallHelper.close_raw_connections()
         
         if errors:
             OutputHelper._console.print("\n[red]Download errors:[/red]")
@@ -767,7 +738,6 @@ def _install_spec_internal(spec: str, live=None, update_callback=None):
         total = len(local_list)
         
         if not live and not update_callback:
-            from rich.spinner import Spinner
             temp_panel = Panel(
                 Spinner("dots", text=f" Preparing {total} files for installation..."),
                 title="Compiling", title_align="left", border_style=OutputHelper._resolve_category_color('data'),
@@ -778,6 +748,10 @@ def _install_spec_internal(spec: str, live=None, update_callback=None):
         else:
             temp_live = None
         
+        CompilerHelper.compile_many_to_staging(
+            [(abs_file, base) for abs_file, _rel in local_list if abs_file.endswith(".py")]
+        )
+        
         batch_specs = []
         unique_dirs = set()
         for abs_file, rel in local_list:
@@ -792,7 +766,6 @@ def _install_spec_internal(spec: str, live=None, update_callback=None):
                     remote_dir = InstallHelper.remote_dir_for(scope, rel_dir)
                     
                     if is_python:
-                        CompilerHelper.compile_to_staging(abs_file, base)
                         out_file = CompilerHelper.staging_out_for(abs_file, base, CompilerHelper.mpy_arch_tag())
                         remote_path = ("/" + remote_dir + os.path.splitext(parts[-1])[0] + ".mpy").replace("//", "/")
                     else:
@@ -806,7 +779,6 @@ def _install_spec_internal(spec: str, live=None, update_callback=None):
             remote_dir = InstallHelper.remote_dir_for(scope, rel_dir)
             
             if is_python:
-                CompilerHelper.compile_to_staging(abs_file, base)
                 out_file = CompilerHelper.staging_out_for(abs_file, base, CompilerHelper.mpy_arch_tag())
                 remote_path = ("/" + remote_dir + os.path.splitext(os.path.basename(rel))[0] + ".mpy").replace("//", "/")
             else:
@@ -920,7 +892,7 @@ def _install_spec_internal(spec: str, live=None, update_callback=None):
         if live is not None:
             do_install(live)
         else:
-            with Live(OutputHelper.create_progress_panel(0, total_bytes_all, title=f"Installing {spec} to {STATE.device}", message=f"Processing {total} file(s)...", counter_text=f"(0B/{OutputHelper.format_bytes(total_bytes_all)})"), console=OutputHelper._console, refresh_per_second=10) as internal_live:
+            with OutputHelper.live_context(OutputHelper.create_progress_panel(0, total_bytes_all, title=f"Installing {spec} to {STATE.device}", message=f"Processing {total} file(s)...", counter_text=f"(0B/{OutputHelper.format_bytes(total_bytes_all)})")) as internal_live:
                 do_install(internal_live)
         
         return {"files": total, "bytes": total_bytes_all}
@@ -974,12 +946,11 @@ def _pkg_update(args: list[str], owner: str = "PlanXLab", repo: str = "replx_lib
         upload_files = []
         total_size = 0
         
-        for ap in py_files:
-            CompilerHelper.compile_to_staging(ap, base)
+        out_mpys = CompilerHelper.compile_many_to_staging([(ap, base) for ap in py_files])
+        for ap, out_mpy in zip(py_files, out_mpys):
             rel = os.path.relpath(ap, base).replace("\\", "/")
             remote = f"/{base_target}/{rel}"
             remote = remote[:-3] + ".mpy"
-            out_mpy = CompilerHelper.staging_out_for(ap, base, CompilerHelper.mpy_arch_tag())
             rel_dir = f"{base_target}/{os.path.dirname(rel)}".rstrip("/")
             file_size = os.path.getsize(out_mpy)
             upload_files.append((out_mpy, remote, rel_dir, file_size))
@@ -1017,7 +988,7 @@ def _pkg_update(args: list[str], owner: str = "PlanXLab", repo: str = "replx_lib
                 if isinstance(data, dict):
                     progress_state["current"] = data.get("current", 0)
         
-        with Live(OutputHelper.create_progress_panel(0, total_size, title=f"Updating {folder_name} to {STATE.device}", message=f"Preparing...", counter_text=f"0/{OutputHelper.format_bytes(total_size)}"), console=OutputHelper._console, refresh_per_second=10) as live:
+        with OutputHelper.live_context(OutputHelper.create_progress_panel(0, total_size, title=f"Updating {folder_name} to {STATE.device}", message=f"Preparing...", counter_text=f"0/{OutputHelper.format_bytes(total_size)}")) as live:
             for idx, (local_file, remote, _, file_size) in enumerate(upload_files):
                 filename = os.path.basename(local_file)
                 
@@ -1088,7 +1059,7 @@ def _pkg_update(args: list[str], owner: str = "PlanXLab", repo: str = "replx_lib
                 if isinstance(data, dict):
                     progress_state["current"] = data.get("current", 0)
         
-        with Live(OutputHelper.create_progress_panel(0, file_size, title=f"Updating {name} to {STATE.device}", message="Uploading...", counter_text=f"0/{OutputHelper.format_bytes(file_size)}"), console=OutputHelper._console, refresh_per_second=10) as live:
+        with OutputHelper.live_context(OutputHelper.create_progress_panel(0, file_size, title=f"Updating {name} to {STATE.device}", message="Uploading...", counter_text=f"0/{OutputHelper.format_bytes(file_size)}")) as live:
             upload_result = [None]
             def do_upload():
                 try:
@@ -1194,14 +1165,53 @@ def _pkg_update(args: list[str], owner: str = "PlanXLab", repo: str = "replx_lib
     return
 
 
+def _remove_with_retry(remove, path: str, errors: list[tuple[str, str]]) -> bool:
+    try:
+        remove(path)
+        return True
+    except FileNotFoundError:
+        return True
+    except OSError:
+        pass
+    # Read-only leftovers (common after a failed install on Windows): make writable and retry once.
+    try:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD | stat.S_IEXEC)
+        remove(path)
+        return True
+    except OSError as e:
+        errors.append((path, str(e)))
+        return False
+
+
+def _rmtree_with_size(path: str, errors: list[tuple[str, str]]) -> int:
+    total = 0
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError as e:
+        errors.append((path, str(e)))
+        return 0
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            total += _rmtree_with_size(entry.path, errors)
+            continue
+        try:
+            size = entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            size = 0
+        if _remove_with_retry(os.unlink, entry.path, errors):
+            total += size
+    _remove_with_retry(os.rmdir, path, errors)
+    return total
+
+
 def _pkg_clean(args: list[str]):
-    import shutil
-    
     _ensure_connected()
     
+    device_slug = device_name_to_path(STATE.device)
     pkg_root = StoreManager.pkg_root()
     core_path = os.path.join(pkg_root, "core", STATE.core)
-    device_path = os.path.join(pkg_root, "device", device_name_to_path(STATE.device))
+    device_path = os.path.join(pkg_root, "device", device_slug)
     meta_path = StoreManager.local_meta_path()
     
     core_exists = os.path.isdir(core_path)
@@ -1217,41 +1227,45 @@ def _pkg_clean(args: list[str]):
         return
     
     removed_items = []
+    failed_items = []
     total_size = 0
+    errors: list[tuple[str, str]] = []
     
-    def get_dir_size(path: str) -> int:
-        total = 0
-        for dirpath, dirnames, filenames in os.walk(path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                try:
-                    total += os.path.getsize(fp)
-                except OSError:
-                    pass
-        return total
+    trees = []
+    if core_exists:
+        trees.append(("core", core_path, f"core/{STATE.core}/"))
+    if device_exists:
+        trees.append(("device", device_path, f"device/{STATE.device}/"))
     
     try:
-        if core_exists:
-            size = get_dir_size(core_path)
-            shutil.rmtree(core_path)
-            removed_items.append(f"core/{STATE.core}/ ({OutputHelper.format_bytes(size)})")
-            total_size += size
-        
-        if device_exists:
-            size = get_dir_size(device_path)
-            shutil.rmtree(device_path)
-            removed_items.append(f"device/{STATE.device}/ ({OutputHelper.format_bytes(size)})")
-            total_size += size
+        cleaned = set()
+        with ThreadPoolExecutor(max_workers=len(trees)) as executor:
+            futures = []
+            for scope, path, label in trees:
+                tree_errors: list[tuple[str, str]] = []
+                futures.append((scope, label, tree_errors, executor.submit(_rmtree_with_size, path, tree_errors)))
+            for scope, label, tree_errors, future in futures:
+                size = future.result()
+                total_size += size
+                if tree_errors:
+                    # Partly removed: keep its registry entries so the store and metadata stay consistent.
+                    errors.extend(tree_errors)
+                    failed_items.append(f"{label} ({len(tree_errors)} item(s) left, {OutputHelper.format_bytes(size)} freed)")
+                else:
+                    cleaned.add(scope)
+                    removed_items.append(f"{label} ({OutputHelper.format_bytes(size)})")
+        core_cleaned = "core" in cleaned
+        device_cleaned = "device" in cleaned
         
-        if meta_exists:
+        if meta_exists and cleaned:
             local_meta = StoreManager.load_local_meta()
             local_packages = local_meta.get("packages", {})
             
-            core_prefix = f"core:{STATE.core}:"
-            device_prefix = f"device:{device_name_to_path(STATE.device)}:"
-            
-            keys_to_remove = [k for k in local_packages.keys() 
-                             if k.startswith(core_prefix) or k.startswith(device_prefix)]
+            keys_to_remove = []
+            if core_cleaned:
+                keys_to_remove += StoreManager.package_keys(f"core:{STATE.core}:")
+            if device_cleaned:
+                keys_to_remove += StoreManager.package_keys(f"device:{device_slug}:")
             
             entries_removed = 0
             if keys_to_remove:
@@ -1259,15 +1273,14 @@ def _pkg_clean(args: list[str]):
                     del local_packages[key]
                 entries_removed += len(keys_to_remove)
             
-            if core_exists and "platform_cores" in local_meta:
+            if core_cleaned and "platform_cores" in local_meta:
                 if STATE.core in local_meta["platform_cores"]:
                     del local_meta["platform_cores"][STATE.core]
                     entries_removed += 1
             
-            if device_exists and "device_configs" in local_meta:
-                device_key = device_name_to_path(STATE.device)
-                if device_key in local_meta["device_configs"]:
-                    del local_meta["device_configs"][device_key]
+            if device_cleaned and "device_configs" in local_meta:
+                if device_slug in local_meta["device_configs"]:
+                    del local_meta["device_configs"][device_slug]
                     entries_removed += 1
             
             if entries_removed > 0:
@@ -1283,6 +1296,17 @@ def _pkg_clean(args: list[str]):
                 border_style="success"
             )
         
+        if errors:
+            failed_text = "\n".join(f"  [red]✗[/red] {item}" for item in failed_items)
+            shown = "\n".join(f"  [red]✗[/red] {path}: {err}" for path, err in errors[:10])
+            more = f"\n  ... and {len(errors) - 10} more" if len(errors) > 10 else ""
+            OutputHelper.print_panel(
+                f"Not fully removed (registry entries kept):\n{failed_text}\n\n"
+                f"Could not remove {len(errors)} item(s):\n{shown}{more}",
+                title="Clean Warning",
+                border_style="warning"
+            )
+        
     except Exception as e:
         OutputHelper.print_panel(
             f"Failed to clean local store: [red]{e}[/red]",
@@ -1292,6 +1316,15 @@ def _pkg_clean(args: list[str]):
         raise typer.Exit(1)
 
 
+def _mpy_output_multi_error():
+    OutputHelper.print_panel(
+        "The [yellow]-o/--output[/yellow] option can only be used with a single file.",
+        title="Invalid Option",
+        border_style="error"
+    )
+    raise typer.Exit(1)
+
+
 @app.command(name="mpy", rich_help_panel="Package Management")
 def mpy(
     files: list[str] = typer.Argument(None, help="Python files or directories to compile"),
@@ -1342,6 +1375,9 @@ Compile Python files to MicroPython bytecode (.mpy).
         )
         raise typer.Exit(1)
     
+    if output and len(files) > 1:
+        _mpy_output_multi_error()
+    
     _ensure_connected()
     target_arch = STATE.core
     
@@ -1361,12 +1397,31 @@ Compile Python files to MicroPython bytecode (.mpy).
             for m in matches:
                 if m.endswith('.py') and os.path.isfile(m):
                     py_files.append(os.path.abspath(m))
-        elif os.path.isdir(pattern):
-            for root, _, fnames in os.walk(pattern):
-                for fn in fnames:
-                    if fn.endswith('.py'):
-                        py_files.append(os.path.abspath(os.path.join(root, fn)))
-        elif os.path.isfile(pattern):
+            continue
+        
+        try:
+            mode = os.stat(pattern).st_mode
+        except OSError:
+            mode = 0
+        
+        if stat.S_ISDIR(mode):
+            stack = [os.path.abspath(pattern)]
+            while stack:
+                # Unreadable directories are skipped, as os.walk did.
+                try:
+                    with os.scandir(stack.pop()) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+                for entry in entries:
+                    try:
+                        if entry.name.endswith('.py') and entry.is_file():
+                            py_files.append(entry.path)
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                    except OSError:
+                        continue
+        elif stat.S_ISREG(mode):
             if pattern.endswith('.py'):
                 py_files.append(os.path.abspath(pattern))
             else:
@@ -1393,15 +1448,10 @@ Compile Python files to MicroPython bytecode (.mpy).
         raise typer.Exit(1)
     
     if output and len(py_files) > 1:
-        OutputHelper.print_panel(
-            "The [yellow]-o/--output[/yellow] option can only be used with a single file.",
-            title="Invalid Option",
-            border_style="error"
-        )
-        raise typer.Exit(1)
+        _mpy_output_multi_error()
     
     version = STATE.version if STATE.version else "1.24.0"
-    arch_args = CompilerHelper._march_for_core(target_arch, version)
+    arch_args = tuple(CompilerHelper._march_for_core(target_arch, version))
     
     compiled = []
     failed = []
@@ -1419,22 +1469,32 @@ Compile Python files to MicroPython bytecode (.mpy).
         )
         raise typer.Exit(1)
     
+    normalized_output = None
+    if output:
+        normalized_output = output if output.endswith('.mpy') else output + '.mpy'
+    
+    jobs = []
     for py_file in py_files:
         src_size = os.path.getsize(py_file)
         total_src_size += src_size
         
-        if output:
-            out_mpy = output if output.endswith('.mpy') else output + '.mpy'
-        else:
-            out_mpy = os.path.splitext(py_file)[0] + '.mpy'
-        
-        try:
-            compiled_out = CompilerHelper.compile_file(py_file, out_mpy, target_arch, version)
-            mpy_size = os.path.getsize(compiled_out)
-            total_mpy_size += mpy_size
-            compiled.append((py_file, compiled_out, src_size, mpy_size))
-        except Exception as e:
-            failed.append((py_file, str(e)))
+        out_mpy = normalized_output or py_file[:-3] + '.mpy'
+        jobs.append((py_file, out_mpy, src_size))
+    
+    max_workers = min(len(jobs), os.cpu_count() or 4, 8)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(CompilerHelper.compile_file, py_file, out_mpy, target_arch, version, arch_args)
+            for py_file, out_mpy, _ in jobs
+        ]
+        for (py_file, _, src_size), future in zip(jobs, futures):
+            try:
+                compiled_out = future.result()
+                mpy_size = os.path.getsize(compiled_out)
+                total_mpy_size += mpy_size
+                compiled.append((py_file, compiled_out, src_size, mpy_size))
+            except Exception as e:
+                failed.append((py_file, str(e)))
     
     if compiled:
         if len(compiled) == 1:
@@ -1502,7 +1562,7 @@ Compile Python files to MicroPython bytecode (.mpy).
 
             upload_thread = threading.Thread(target=do_upload, daemon=True)
 
-            with Live(OutputHelper.create_progress_panel(0, mpy_size, title=f"Installing to {STATE.device}", message=f"{basename} ({OutputHelper.format_bytes(mpy_size)})", counter_text=f"0/{OutputHelper.format_bytes(mpy_size)}"), console=OutputHelper._console, refresh_per_second=10) as live:
+            with OutputHelper.live_context(OutputHelper.create_progress_panel(0, mpy_size, title=f"Installing to {STATE.device}", message=f"{basename} ({OutputHelper.format_bytes(mpy_size)})", counter_text=f"0/{OutputHelper.format_bytes(mpy_size)}")) as live:
                 upload_thread.start()
                 while upload_thread.is_alive():
                     with progress_lock:
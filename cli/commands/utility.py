@@ -1,14 +1,16 @@
 import os
 import re
+import sys
+import bisect
 import time
-import threading
+from functools import lru_cache
+from itertools import cycle
 from typing import Optional
 
 import typer
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.live import Live
-from rich.spinner import Spinner
+from rich.text import Text
 
 from replx import __version__
 from replx.terminal import IS_WINDOWS
@@ -24,23 +26,34 @@ from ..config import (
     _find_env_file, _find_running_agent_ports,
 )
 from ..connection import (
-    _ensure_connected, _create_agent_client,
+    _ensure_connected, _invalidate_ensured, _create_agent_client,
     _get_current_agent_port
 )
 from ..app import app
 
 
+_CONSOLE = Console(width=CONSOLE_WIDTH)
+
+_TRAILING_NUM_RE = re.compile(r"(\d+)$")
+
+
 def _port_sort_key(port: str) -> tuple:
     if port is None:
         return ("", -1)
     p = str(port).strip()
-    m = re.search(r"(\d+)$", p)
+    m = _TRAILING_NUM_RE.search(p)
     if m:
         return (p[: m.start()].lower(), int(m.group(1)))
     return (p.lower(), 0)
 
 
 def _sorted_unique_ports(ports: list[str | None]) -> list[str]:
+    if not ports:
+        return []
+    if len(ports) == 1:
+        s = str(ports[0]).strip() if ports[0] else ""
+        return [s] if s else []
+
     seen = set()
     out: list[str] = []
     for p in ports:
@@ -57,7 +70,27 @@ def _sorted_unique_ports(ports: list[str | None]) -> list[str]:
     return out
 
 
-def _get_connection_info_for_port(connections: dict, port: Optional[str]) -> dict:
+def _connections_lower_index(connections: dict) -> Optional[dict]:
+    if not IS_WINDOWS:
+        return None
+    return {key.lower(): value for key, value in connections.items() if isinstance(key, str)}
+
+
+def _port_match_key(port) -> str:
+    s = str(port).strip()
+    return s.lower() if IS_WINDOWS else s
+
+
+def _ordered_session_ports(fg_port: Optional[str], bg_ports: list[str]) -> list[str]:
+    # bg_ports comes from _get_session_list_data, already stripped, unique and sorted
+    out = list(bg_ports or ())
+    fg = str(fg_port).strip() if fg_port else ""
+    if fg and fg not in out:
+        bisect.insort(out, fg, key=_port_sort_key)
+    return out
+
+
+def _get_connection_info_for_port(connections: dict, port: Optional[str], lower_index: Optional[dict] = None) -> dict:
     if not port or not connections:
         return {}
 
@@ -65,6 +98,9 @@ def _get_connection_info_for_port(connections: dict, port: Optional[str]) -> dic
         return connections.get(port, {}) or {}
 
     if IS_WINDOWS:
+        if lower_index is not None:
+            return lower_index.get(port.lower()) or {}
+
         upper = port.upper()
         if upper in connections:
             return connections.get(upper, {}) or {}
@@ -80,13 +116,7 @@ def _get_connection_info_for_port(connections: dict, port: Optional[str]) -> dic
     return {}
 
 
-@app.command(name="version", hidden=True)
-def version_cmd(
-    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
-):
-    if show_help:
-        console = Console(width=CONSOLE_WIDTH)
-        help_text = """\
+_VERSION_HELP = """\
 Show replx version information.
 
 [bold cyan]Usage:[/bold cyan]
@@ -96,8 +126,15 @@ Show replx version information.
 [bold cyan]Examples:[/bold cyan]
   replx version           [dim]# Show version[/dim]
   replx -v                [dim]# Same as above[/dim]"""
-        OutputHelper.print_panel(help_text, title="version", border_style="help")
-        console.print()
+
+
+@app.command(name="version", hidden=True)
+def version_cmd(
+    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
+):
+    if show_help:
+        OutputHelper.print_panel(_VERSION_HELP, title="version", border_style="help")
+        _CONSOLE.print()
         raise typer.Exit()
     
     OutputHelper.print_panel(
@@ -107,7 +144,27 @@ Show replx version information.
     )
 
 
+_SESSION_LIST_CACHE_TTL = 1.0
+_SESSIONS_CACHE = {'t': 0.0, 'v': None}
+
+
 def _get_session_list_data():
+    cached = _SESSIONS_CACHE['v']
+    if cached is not None and time.monotonic() - _SESSIONS_CACHE['t'] < _SESSION_LIST_CACHE_TTL:
+        return cached
+
+    result = _query_session_list_data()
+    _SESSIONS_CACHE['v'] = result
+    _SESSIONS_CACHE['t'] = time.monotonic()
+    return result
+
+
+def _clear_session_list_cache() -> None:
+    _SESSIONS_CACHE['t'] = 0.0
+    _SESSIONS_CACHE['v'] = None
+
+
+def _query_session_list_data():
     env_path = _find_env_file()
     running_agent_ports = _find_running_agent_ports(env_path)
     if not running_agent_ports:
@@ -255,15 +312,34 @@ def _handle_session_list_error(error: Optional[str], *, no_server_title: str, no
     return False
 
 
+_SEG_SEP = "  "
+_SEG_OPEN = "  ["
+_SEG_TAG_END = "]"
+_SEG_CLOSE = "[/"
+_SEG_CLOSE_SEP = "]  "
+_SEG_CLOSE_OPEN = "]  ["
+_SEG_DIM = "[dim]"
+_SEG_DIM_CLOSE = "[/dim]"
+_DUP_SELECTOR = "[dim] 󰌹  [/dim]"
+
+
 def _num_to_bracket(n: int) -> str:
     return f"[{n}]".rjust(4)
 
 
+# Invalid answers the fg picker takes before giving up as if Enter was pressed.
+_PICK_MAX_ATTEMPTS = 5
+
+
 def _print_session_list_interactive(sessions_data, current_ppid):
+    if not sys.stdin.isatty():
+        return None, None
+
     sessions = sessions_data['sessions']
     connections = sessions_data['connections']
+    conn_by_lower = _connections_lower_index(connections)
     
-    color_map = ["yellow", "green", "blue"]
+    color_iter = cycle(("yellow", "green", "blue"))
     
     sessions_sorted = sorted(sessions, key=lambda s: (not s.get('is_current'), s.get('ppid', 0)))
     
@@ -273,31 +349,49 @@ def _print_session_list_interactive(sessions_data, current_ppid):
             current_fg = sess['foreground']
             break
     
-    all_ports = list(connections.keys())
-    all_versions = [c.get('version', '?') for c in connections.values()]
-    all_cores = [c.get('core', '?') for c in connections.values()]
-    all_devices = [c.get('device', '?') for c in connections.values()]
-    
-    PORT_W = max((len(p) for p in all_ports), default=4)
     STATUS_W = 4
-    VER_W = max((len(v) for v in all_versions), default=6)
-    CORE_W = max((len(c) for c in all_cores), default=6)
-    DEV_W = max((len(d) for d in all_devices), default=6)
+    if connections:
+        PORT_W = VER_W = CORE_W = DEV_W = 0
+        for p, c in connections.items():
+            if len(p) > PORT_W:
+                PORT_W = len(p)
+            v = c.get('version', '?')
+            if len(v) > VER_W:
+                VER_W = len(v)
+            cr = c.get('core', '?')
+            if len(cr) > CORE_W:
+                CORE_W = len(cr)
+            d = c.get('device', '?')
+            if len(d) > DEV_W:
+                DEV_W = len(d)
+    else:
+        PORT_W, VER_W, CORE_W, DEV_W = 4, 6, 6, 6
     
     content_lines = []
     selectable_map = {}
     select_num = 1
-    row_idx = 0
     
     numbered_ports = set()
     if current_fg:
         numbered_ports.add(current_fg)
     
-    def make_row(selector, port, version, core, device, manufacturer, color, dimmed=False):
-        if dimmed:
-            return f"{selector:>4}  {port:>{PORT_W}}  {version:<{VER_W}}  {core:<{CORE_W}}  {device:<{DEV_W}}  {manufacturer}"
-        else:
-            return f"{selector:>4}  [{color}]{port:>{PORT_W}}[/{color}]  {version:<{VER_W}}  {core:<{CORE_W}}  [{color}]{device:<{DEV_W}}[/{color}]  [dim]{manufacturer}[/dim]"
+    def make_row(selector, color, port, status_color, status, version, core, device, manufacturer):
+        seg = [selector, _SEG_OPEN, color, _SEG_TAG_END, port.rjust(PORT_W),
+               _SEG_CLOSE, color, _SEG_CLOSE_OPEN, status_color, _SEG_TAG_END, status.ljust(STATUS_W),
+               _SEG_CLOSE, status_color, _SEG_CLOSE_SEP, version.ljust(VER_W),
+               _SEG_SEP, core.ljust(CORE_W),
+               _SEG_OPEN, color, _SEG_TAG_END, device.ljust(DEV_W),
+               _SEG_CLOSE, color, _SEG_CLOSE_SEP, _SEG_DIM, manufacturer, _SEG_DIM_CLOSE]
+        return "".join(seg)
+
+    def make_dim_row(selector, port, status, version, core, device, manufacturer):
+        seg = [selector, _SEG_SEP, _SEG_DIM, port.rjust(PORT_W),
+               _SEG_SEP, status.ljust(STATUS_W),
+               _SEG_SEP, version.ljust(VER_W),
+               _SEG_SEP, core.ljust(CORE_W),
+               _SEG_SEP, device.ljust(DEV_W),
+               _SEG_SEP, manufacturer, _SEG_DIM_CLOSE]
+        return "".join(seg)
     
     for sess in sessions_sorted:
         ppid = sess.get('ppid')
@@ -310,13 +404,12 @@ def _print_session_list_interactive(sessions_data, current_ppid):
         else:
             content_lines.append(f"[dim]SID: {ppid}[/dim]")
         
-        ordered_ports = _sorted_unique_ports(([fg_port] if fg_port else []) + list(bg_ports or []))
+        ordered_ports = _ordered_session_ports(fg_port, bg_ports)
 
         if ordered_ports:
-            conn_info = _get_connection_info_for_port(connections, fg_port)
             for p in ordered_ports:
                 is_fg = bool(fg_port and p == fg_port)
-                conn_info = _get_connection_info_for_port(connections, p)
+                conn_info = _get_connection_info_for_port(connections, p, conn_by_lower)
                 version = conn_info.get('version', '?')
                 core = conn_info.get('core', '?')
                 device = conn_info.get('device', '?')
@@ -325,30 +418,25 @@ def _print_session_list_interactive(sessions_data, current_ppid):
                 status = 'busy' if is_busy else 'idle'
                 status_color = 'red' if is_busy else 'green'
 
-                color = color_map[row_idx % len(color_map)]
-                row_idx += 1
+                color = next(color_iter)
 
                 p_disp = OutputHelper.format_port(p)
 
                 if is_current and is_fg:
                     selector = f"[{color}] 󱓥  [/{color}]"
-                    line = f"{selector}  [{color}]{p_disp:>{PORT_W}}[/{color}]  [{status_color}]{status:<{STATUS_W}}[/{status_color}]  {version:<{VER_W}}  {core:<{CORE_W}}  [{color}]{device:<{DEV_W}}[/{color}]  [dim]{manufacturer}[/dim]"
-                    content_lines.append(line)
+                    content_lines.append(make_row(selector, color, p_disp, status_color, status,
+                                                  version, core, device, manufacturer))
                 elif p not in numbered_ports:
                     bracket = _num_to_bracket(select_num)
                     selectable_map[select_num] = p
                     numbered_ports.add(p)
                     select_num += 1
                     selector = f"[bright_cyan]{bracket}[/bright_cyan]"
-                    icon = "󱓥" if is_fg else " "
-                    line = f"{selector}  [{color}]{p_disp:>{PORT_W}}[/{color}]  [{status_color}]{status:<{STATUS_W}}[/{status_color}]  {version:<{VER_W}}  {core:<{CORE_W}}  [{color}]{device:<{DEV_W}}[/{color}]  [dim]{manufacturer}[/dim]"
-                    if icon and is_fg and is_current:
-                        pass
-                    content_lines.append(line)
+                    content_lines.append(make_row(selector, color, p_disp, status_color, status,
+                                                  version, core, device, manufacturer))
                 else:
-                    selector = "[dim] 󰌹  [/dim]"
-                    line = f"{selector}  [dim]{p_disp:>{PORT_W}}  {status:<{STATUS_W}}  {version:<{VER_W}}  {core:<{CORE_W}}  {device:<{DEV_W}}  {manufacturer}[/dim]"
-                    content_lines.append(line)
+                    content_lines.append(make_dim_row(_DUP_SELECTOR, p_disp, status,
+                                                      version, core, device, manufacturer))
         
         content_lines.append("")
     
@@ -363,42 +451,36 @@ def _print_session_list_interactive(sessions_data, current_ppid):
     if not selectable_map:
         return None, None
     
-    console = Console(width=CONSOLE_WIDTH)
     max_num = max(selectable_map.keys())
     prompt = f"\n[bright_cyan]\\[1-{max_num}] switch, \\[Enter] quit: [/bright_cyan]"
     
-    while True:
+    for _ in range(_PICK_MAX_ATTEMPTS):
         try:
-            choice = console.input(prompt)
+            choice = _CONSOLE.input(prompt)
             choice = choice.strip().lower()
             
             if choice == 'q' or choice == '':
                 return None, None
             
-            try:
-                num = int(choice)
+            if choice.isdecimal():
+                num = int(choice, 10)
                 if num in selectable_map:
                     return selectable_map[num], None
-                else:
-                    console.print(f"[red]Invalid selection: {num}[/red]")
-            except ValueError:
-                console.print(f"[red]Invalid input: {choice}[/red]")
+                _CONSOLE.print(f"[red]Invalid selection: {num}[/red]")
+            else:
+                _CONSOLE.print(f"[red]Invalid input: {choice}[/red]")
         except KeyboardInterrupt:
-            console.print()
+            _CONSOLE.print()
             return None, None
+    return None, None
 
 
 def _print_session_list_status(sessions_data, current_ppid):
     from rich.table import Table
-    from rich.console import Console
-    from io import StringIO
-    from rich.text import Text
-    from rich.panel import Panel
-    from ..helpers import CONSOLE_WIDTH
-    from ..helpers.output import get_panel_box
-    
+
     sessions = sessions_data['sessions']
     connections = sessions_data['connections']
+    conn_by_lower = _connections_lower_index(connections)
     
     all_defaults = set()
     for sess in sessions:
@@ -417,20 +499,30 @@ def _print_session_list_status(sessions_data, current_ppid):
     
     COLUMN_PADDING = 2
     
-    string_io = StringIO()
-    temp_console = Console(file=string_io, force_terminal=True, width=300)
+    BUSY_CURRENT = Text("busy", style="red")
+    IDLE_CURRENT = Text("idle", style="green")
+    BUSY_DIM = Text("busy", style="dim red")
+    IDLE_DIM = Text("idle", style="dim green")
+    
+    COLUMNS = ("conn", "port", "default", "status", "version", "core", "device", "manufacturer")
     
     def get_conn_marker(is_foreground, is_current):
         if not is_foreground:
-            return ""
-        return "[green]󱓥[/green]" if is_current else "[dim]󱓥[/dim]"
+            return Text("")
+        return Text("󱓥", style="green" if is_current else "dim")
     
-    def get_default_marker(port, is_current):
-        is_default = _port_key(port) in all_defaults_keyed
-        if not is_default:
-            return ""
-        return "[bright_yellow]󰷌[/bright_yellow]" if is_current else "[dim]󰷌[/dim]"
+    port_key_cache: dict[str, str] = {}
     
+    def get_default_marker(port, is_current):
+        pk = port_key_cache.get(port)
+        if pk is None:
+            pk = port.strip().lower() if IS_WINDOWS else port.strip()
+            port_key_cache[port] = pk
+        if pk not in all_defaults_keyed:
+            return Text("")
+        return Text("󰷌", style="bright_yellow" if is_current else "dim")
+    
+    session_rows = []
     for sess in sessions_sorted:
         ppid = sess.get('ppid')
         is_current = sess.get('is_current', False)
@@ -438,49 +530,38 @@ def _print_session_list_status(sessions_data, current_ppid):
         bg_ports = sess.get('backgrounds', [])
         
         if is_current:
-            temp_console.print(f"[bold bright_cyan]\\[SID: {ppid}][/bold bright_cyan]")
+            sid_text = Text(f"[SID: {ppid}]", style="bold bright_cyan")
         else:
-            temp_console.print(f"[dim]SID: {ppid}[/dim]")
-        
-        session_table = Table(show_header=False, box=None, padding=(0, COLUMN_PADDING), collapse_padding=True, expand=False)
-        session_table.add_column("conn", no_wrap=True)
-        session_table.add_column("port", no_wrap=True, justify="right")
-        session_table.add_column("default", no_wrap=True)
-        session_table.add_column("status", no_wrap=True)
-        session_table.add_column("version", no_wrap=True)
-        session_table.add_column("core", no_wrap=True)
-        session_table.add_column("device", no_wrap=True)
-        session_table.add_column("manufacturer", no_wrap=True, overflow="ignore")
+            sid_text = Text(f"SID: {ppid}", style="dim")
+        rows = []
+        session_rows.append((sid_text, rows))
         
-        has_connections = False
-        
-        ordered_ports = _sorted_unique_ports(([fg_port] if fg_port else []) + list(bg_ports or []))
+        ordered_ports = _ordered_session_ports(fg_port, bg_ports)
 
         for p in ordered_ports:
-            has_connections = True
             is_fg = bool(fg_port and p == fg_port)
-            conn_info = _get_connection_info_for_port(connections, p)
+            conn_info = _get_connection_info_for_port(connections, p, conn_by_lower)
             version = conn_info.get('version', '?')
             core = conn_info.get('core', '?')
             device = conn_info.get('device', '?')
             manufacturer = conn_info.get('manufacturer', '')
             is_busy = conn_info.get('busy', False)
+            p_disp = OutputHelper.format_port(p)
             if is_current:
-                status_text = Text("busy", style="red") if is_busy else Text("idle", style="green")
+                status_text = BUSY_CURRENT if is_busy else IDLE_CURRENT
                 version_text = Text(version)
                 core_text = Text(core, style="bright_green")
                 device_text = Text(device, style="bright_yellow")
-                manufacturer_text = Text(manufacturer, style="dim")
-                port_text = Text(OutputHelper.format_port(p), style="bright_cyan")
+                port_text = Text(p_disp, style="bright_cyan")
             else:
-                status_text = Text("busy", style="dim red") if is_busy else Text("idle", style="dim green")
+                status_text = BUSY_DIM if is_busy else IDLE_DIM
                 version_text = Text(version, style="dim")
                 core_text = Text(core, style="dim")
                 device_text = Text(device, style="dim")
-                manufacturer_text = Text(manufacturer, style="dim")
-                port_text = Text(OutputHelper.format_port(p), style="dim")
+                port_text = Text(p_disp, style="dim")
+            manufacturer_text = Text(manufacturer, style="dim")
 
-            session_table.add_row(
+            rows.append((
                 get_conn_marker(is_fg, is_current),
                 port_text,
                 get_default_marker(p, is_current),
@@ -489,34 +570,41 @@ def _print_session_list_status(sessions_data, current_ppid):
                 core_text,
                 device_text,
                 manufacturer_text
-            )
-        
-        if has_connections:
-            temp_console.print(session_table)
-        
-        temp_console.print()
-    
-    temp_console.print("[dim] 󱓥 foreground  󰷌 default[/dim]")
+            ))
     
-    output_text = string_io.getvalue().rstrip()
-    text_content = Text.from_ansi(output_text)
-    text_content.no_wrap = True
+    # One table per session under its SID line; shared widths keep the columns aligned across sessions.
+    widths = [0] * len(COLUMNS)
+    for _sid_text, rows in session_rows:
+        for row in rows:
+            for i, cell in enumerate(row):
+                widths[i] = max(widths[i], cell.cell_len)
+    
+    renderables = []
+    for sid_text, rows in session_rows:
+        renderables.append(sid_text)
+        if rows:
+            table = Table(show_header=False, box=None, padding=(0, COLUMN_PADDING), collapse_padding=True, expand=False)
+            for name, width in zip(COLUMNS, widths):
+                table.add_column(
+                    name, no_wrap=True, min_width=width,
+                    justify="right" if name == "port" else "left",
+                    overflow="ignore" if name == "manufacturer" else "ellipsis",
+                )
+            for row in rows:
+                table.add_row(*row)
+            renderables.append(table)
+        renderables.append(Text(""))
+    renderables.append(Text(" 󱓥 foreground  󰷌 default", style="dim"))
     
     OutputHelper.print_panel(
-        text_content,
+        Group(*renderables),
         title="Sessions",
         title_align="left",
         border_style="data"
     )
 
 
-@app.command(rich_help_panel="Connection & Session")
-def status(
-    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
-):
-    if show_help:
-        console = Console(width=CONSOLE_WIDTH)
-        help_text = """\
+_STATUS_HELP = """\
 Show all active sessions and their board connections.
 
 Displays a table of all terminal sessions with their connected boards.
@@ -551,8 +639,15 @@ Displays a table of all terminal sessions with their connected boards.
 [bold cyan]Related:[/bold cyan]
   replx fg COM3         [dim]# Switch FG to different board[/dim]
   replx disconnect      [dim]# Release current FG connection[/dim]"""
-        OutputHelper.print_panel(help_text, title="status", border_style="help")
-        console.print()
+
+
+@app.command(rich_help_panel="Connection & Session")
+def status(
+    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
+):
+    if show_help:
+        OutputHelper.print_panel(_STATUS_HELP, title="status", border_style="help")
+        _CONSOLE.print()
         raise typer.Exit()
     
     sessions_data, current_ppid, error = _get_session_list_data()
@@ -579,13 +674,7 @@ Displays a table of all terminal sessions with their connected boards.
     _print_session_list_status(sessions_data, current_ppid)
 
 
-@app.command(rich_help_panel="Connection & Session")
-def fg(
-    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
-):
-    if show_help:
-        console = Console(width=CONSOLE_WIDTH)
-        help_text = """\
+_FG_HELP = """\
 Switch foreground connection to another board.
 
 When you have multiple boards connected, use this to switch between them.
@@ -612,8 +701,15 @@ When you have multiple boards connected, use this to switch between them.
 
 [bold cyan]Related:[/bold cyan]
   replx status                [dim]# See all active connections[/dim]"""
-        OutputHelper.print_panel(help_text, title="fg", border_style="help")
-        console.print()
+
+
+@app.command(rich_help_panel="Connection & Session")
+def fg(
+    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
+):
+    if show_help:
+        OutputHelper.print_panel(_FG_HELP, title="fg", border_style="help")
+        _CONSOLE.print()
         raise typer.Exit()
     
     global_opts = _get_global_options()
@@ -622,21 +718,38 @@ When you have multiple boards connected, use this to switch between them.
     if port:
         switch_target = port
         target_agent_port = _get_current_agent_port()
+        needle = _port_match_key(switch_target)
 
-        sessions_data, _current_ppid, _error = _get_session_list_data()
-        if sessions_data and not _error:
-            needle = str(switch_target).strip().lower() if IS_WINDOWS else str(switch_target).strip()
-            for key, conn_info in sessions_data.get('connections', {}).items():
-                if not isinstance(key, str):
-                    continue
-                key_cmp = key.strip().lower() if IS_WINDOWS else key.strip()
-                if key_cmp == needle:
-                    switch_target = key
-                    target_agent_port = conn_info.get('agent_port', target_agent_port)
-                    break
         try:
+            result = None
+            matched = False
             with AgentClient(port=target_agent_port) as client:
-                result = client.send_command('session_switch_fg', port=switch_target, timeout=3.0)
+                try:
+                    session_info = client.send_command('session_info', timeout=1.5)
+                except Exception:
+                    session_info = {}
+                for conn in session_info.get('connections', []):
+                    key = conn.get('port')
+                    if isinstance(key, str) and _port_match_key(key) == needle:
+                        switch_target = key
+                        matched = True
+                        break
+                if matched:
+                    result = client.send_command('session_switch_fg', port=switch_target, timeout=3.0)
+
+            if not matched:
+                # The connection may be owned by another running agent
+                sessions_data, _current_ppid, _error = _get_session_list_data()
+                if sessions_data and not _error:
+                    for key, conn_info in sessions_data.get('connections', {}).items():
+                        if isinstance(key, str) and _port_match_key(key) == needle:
+                            switch_target = key
+                            target_agent_port = conn_info.get('agent_port', target_agent_port)
+                            break
+                with AgentClient(port=target_agent_port) as client:
+                    result = client.send_command('session_switch_fg', port=switch_target, timeout=3.0)
+            _clear_session_list_cache()
+            _invalidate_ensured()
             
             if result and result.get('success'):
                 OutputHelper.print_panel(
@@ -671,6 +784,15 @@ When you have multiple boards connected, use this to switch between them.
     ):
         raise typer.Exit()
     
+    if not sys.stdin.isatty():
+        OutputHelper.print_panel(
+            "Non-interactive shell: pass the port explicitly.\n\n"
+            "  [bright_green]replx PORT fg[/bright_green]",
+            title="Foreground",
+            border_style="warning"
+        )
+        raise typer.Exit(1)
+    
     selected_port, action = _print_session_list_interactive(sessions_data, current_ppid)
     
     if selected_port:
@@ -678,6 +800,8 @@ When you have multiple boards connected, use this to switch between them.
         try:
             with AgentClient(port=target_agent_port) as client:
                 result = client.send_command('session_switch_fg', port=selected_port, timeout=3.0)
+            _clear_session_list_cache()
+            _invalidate_ensured()
             
             if result and result.get('success'):
                 OutputHelper.print_panel(
@@ -701,13 +825,7 @@ When you have multiple boards connected, use this to switch between them.
             )
 
 
-@app.command(rich_help_panel="Connection & Session")
-def whoami(
-    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
-):
-    if show_help:
-        console = Console(width=CONSOLE_WIDTH)
-        help_text = """\
+_WHOAMI_HELP = """\
 Show which board your commands are currently talking to.
 
 Quickly check your active foreground connection.
@@ -731,8 +849,15 @@ Quickly check your active foreground connection.
 
 [bold cyan]Related:[/bold cyan]
   replx status            [dim]# See all active connections[/dim]"""
-        OutputHelper.print_panel(help_text, title="whoami", border_style="help")
-        console.print()
+
+
+@app.command(rich_help_panel="Connection & Session")
+def whoami(
+    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
+):
+    if show_help:
+        OutputHelper.print_panel(_WHOAMI_HELP, title="whoami", border_style="help")
+        _CONSOLE.print()
         raise typer.Exit()
     
     sessions_data, current_ppid, error = _get_session_list_data()
@@ -775,13 +900,7 @@ Quickly check your active foreground connection.
     )
 
 
-@app.command(rich_help_panel="Connection & Session")
-def disconnect(
-    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
-):
-    if show_help:
-        console = Console(width=CONSOLE_WIDTH)
-        help_text = """\
+_DISCONNECT_HELP = """\
 Close a board connection.
 
 The connection is closed and removed from ALL sessions that reference it.
@@ -808,8 +927,15 @@ The connection is closed and removed from ALL sessions that reference it.
 
 [bold cyan]Related:[/bold cyan]
   replx shutdown                [dim]# Stop ALL connections and agent[/dim]"""
-        OutputHelper.print_panel(help_text, title="disconnect", border_style="help")
-        console.print()
+
+
+@app.command(rich_help_panel="Connection & Session")
+def disconnect(
+    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
+):
+    if show_help:
+        OutputHelper.print_panel(_DISCONNECT_HELP, title="disconnect", border_style="help")
+        _CONSOLE.print()
         raise typer.Exit()
     
     global_opts = _get_global_options()
@@ -858,6 +984,8 @@ The connection is closed and removed from ALL sessions that reference it.
     try:
         with AgentClient(port=target_agent_port) as client:
             result = client.send_command('session_disconnect', port=port, timeout=3.0)
+        _clear_session_list_cache()
+        _invalidate_ensured()
         
         if result.get('freed_port'):
             OutputHelper.print_panel(
@@ -941,13 +1069,7 @@ def _do_shutdown():
         )
 
 
-@app.command(rich_help_panel="Connection & Session")
-def shutdown(
-    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
-):
-    if show_help:
-        console = Console(width=CONSOLE_WIDTH)
-        help_text = """\
+_SHUTDOWN_HELP = """\
 Completely stop the replx agent and release all connections.
 
 This is the "full cleanup" command - stops everything.
@@ -974,35 +1096,38 @@ This is the "full cleanup" command - stops everything.
 
 [bold cyan]Related:[/bold cyan]
   replx disconnect        [dim]# Release only one connection[/dim]"""
-        OutputHelper.print_panel(help_text, title="shutdown", border_style="help")
-        console.print()
-        raise typer.Exit()
-    
-    _do_shutdown()
 
 
-@app.command(rich_help_panel="Device Management")
-def format(
+@app.command(rich_help_panel="Connection & Session")
+def shutdown(
     show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
 ):
     if show_help:
-        console = Console(width=CONSOLE_WIDTH)
-        help_text = """\
+        OutputHelper.print_panel(_SHUTDOWN_HELP, title="shutdown", border_style="help")
+        _CONSOLE.print()
+        raise typer.Exit()
+    
+    _do_shutdown()
+
+
+_FORMAT_HELP = """\
 Format (erase) the filesystem on the connected device.
 
 [bold yellow]⚠ WARNING: This deletes ALL files on the device![/bold yellow]
 
 [bold cyan]Usage:[/bold cyan]
   replx format
+  replx format -f         [dim]# Format even if already empty[/dim]
 
 [bold cyan]What happens:[/bold cyan]
   • All files are deleted (boot.py, main.py, /lib, everything)
+  • Skipped when the filesystem is already empty (use [green]-f[/green] to force)
   • Filesystem is reformatted to empty state
   • Device may reset automatically after format
 
 [bold cyan]When to use:[/bold cyan]
   • To start fresh with a clean device
-  • If filesystem is corrupted
+  • If filesystem is corrupted ([green]replx format -f[/green])
   • Before selling/giving away a device
   • To free up all storage space
 
@@ -1019,54 +1144,51 @@ Format (erase) the filesystem on the connected device.
 
 [bold cyan]Related:[/bold cyan]
   replx init              [dim]# Format AND install libraries[/dim]"""
-        OutputHelper.print_panel(help_text, title="format", border_style="help")
-        console.print()
+
+
+@app.command(rich_help_panel="Device Management")
+def format(
+    force: bool = typer.Option(False, "--force", "-f", help="Format even if the filesystem is already empty"),
+    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
+):
+    if show_help:
+        OutputHelper.print_panel(_FORMAT_HELP, title="format", border_style="help")
+        _CONSOLE.print()
         raise typer.Exit()
     
     _ensure_connected()
     
-    global _is_stop_spinner
-
-    _is_stop_spinner = False
-    frame_idx = [0]
-    
-    def _spinner_task(live):
-        try:
-            while not _is_stop_spinner:
-                live.update(OutputHelper.create_spinner_panel(
-                    f"Formatting file system on {STATE.device}...",
-                    title="Format File System",
-                    frame_idx=frame_idx[0]
-                ))
-                frame_idx[0] += 1
-                time.sleep(0.1)
-        except Exception:
-            pass
+    already_empty = False
+    if not force:
+        with _create_agent_client() as client:
+            already_empty = _device_fs_is_empty(client)
+    if already_empty:
+        OutputHelper.print_panel(
+            f"File system on [bright_yellow]{STATE.device}[/bright_yellow] is already empty.\n"
+            "Use [cyan]replx format -f[/cyan] to format it anyway.",
+            title="Format Skipped",
+            border_style="success"
+        )
+        return True
     
+    from rich.live import Live
+
     ret = None
     error = None
     
     try:
-        with Live(OutputHelper.create_spinner_panel(
-            f"Formatting file system on {STATE.device}...",
-            title="Format File System",
-            frame_idx=0
-        ), console=OutputHelper._console, refresh_per_second=10) as live:
-            spinner_thread = threading.Thread(target=_spinner_task, args=(live,), daemon=True)
-            spinner_thread.start()
-            
+        # The Spinner renderable is animated by Live's own refresh thread, so the RPC
+        # stays on the main thread where Ctrl-C can interrupt it.
+        with Live(_format_panel(f"Formatting file system on {STATE.device}...", title="Format File System"),
+                  console=OutputHelper._console, refresh_per_second=10):
             try:
-                client = _create_agent_client()
-                result = client.send_command('format')
+                with _create_agent_client() as client:
+                    result = client.send_command('format', reconnect_after=STATE.core == 'EFR32MG')
                 ret = result.get('formatted', True) if result else None
             except Exception as e:
                 error = e
-            finally:
-                _is_stop_spinner = True
-                spinner_thread.join(timeout=1.0)
     
     except KeyboardInterrupt:
-        _is_stop_spinner = True
         OutputHelper.print_panel(
             "Format operation cancelled by user.",
             title="Format Cancelled",
@@ -1082,17 +1204,22 @@ Format (erase) the filesystem on the connected device.
         )
         return False
     
+    if ret and STATE.core == 'EFR32MG' and not result.get('reconnected'):
+        # The agent could not re-attach the port itself; fall back to a full reconnect.
+        conn = _resolve_connection(_get_global_options().get('port'))
+        if conn:
+            ok, reconnect_error = _post_format_reconnect(
+                conn.get('agent_port', DEFAULT_AGENT_PORT), conn['connection'],
+                conn.get('core') or STATE.core, conn.get('device') or STATE.device
+            )
+            if not ok:
+                OutputHelper.print_panel(
+                    f"Reconnect after format failed: [red]{reconnect_error}[/red]",
+                    title="Reconnect Failed",
+                    border_style="warning"
+                )
+    
     if ret:
-        if STATE.core == 'EFR32MG':
-            try:
-                time.sleep(1.0)
-                
-                client = _create_agent_client()
-                global_opts = _get_global_options()
-                client.send_command('connect', port=global_opts.get('port'))
-            except Exception:
-                pass
-        
         OutputHelper.print_panel(
             f"File system on [bright_yellow]{STATE.device}[/bright_yellow] has been formatted successfully.",
             title="Format Complete",
@@ -1107,20 +1234,129 @@ Format (erase) the filesystem on the connected device.
     return ret
 
 
-@app.command(rich_help_panel="Device Management")
-def init(
-    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
-):
-    if show_help:
-        console = Console(width=CONSOLE_WIDTH)
-        help_text = """\
+def _device_fs_is_empty(client) -> bool:
+    # Any failure (including a corrupted filesystem) means "not known empty": format.
+    try:
+        result = client.send_command('ls', path='/')
+    except Exception:
+        return False
+    return not (result or {}).get('items')
+
+
+@lru_cache(maxsize=16)
+def _format_panel(message: str, title: str = "Formatting") -> Panel:
+    from rich.spinner import Spinner
+
+    spinner = Spinner("dots", text=f" {message}")
+    return Panel(spinner, title=title, title_align="left", border_style=OutputHelper._resolve_category_color('data'),
+                 box=get_panel_box(), width=CONSOLE_WIDTH)
+
+
+# The board re-enumerates after a format: give it the old 3 s to settle, then retry
+# session_setup with backoff (0.25 s doubling, capped at 2 s) until 7 s have passed.
+_RECONNECT_SETTLE = 3.0
+_RECONNECT_BUDGET = 7.0
+_RECONNECT_MAX_DELAY = 2.0
+
+
+def _serial_port_present(port: str) -> bool:
+    if not IS_WINDOWS:
+        return os.path.exists(port)
+    try:
+        from serial.tools.list_ports import comports as list_ports_comports
+    except Exception:
+        return True
+    needle = port.lower()
+    return any(str(getattr(info, "device", "")).lower() == needle for info in list_ports_comports())
+
+
+def _wait_for_serial_port(port: Optional[str], timeout: float, interval: float = 0.1) -> bool:
+    if not port:
+        return True
+    deadline = time.monotonic() + timeout
+    while not _serial_port_present(port):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+
+def _post_format_reconnect(agent_port: int, port: str, core: str, device: str,
+                           on_status=None) -> tuple[bool, Optional[Exception]]:
+    was_foreground = True
+    with AgentClient(port=agent_port) as client:
+        try:
+            session_info = client.send_command('session_info', timeout=1.0)
+            current_ppid = get_cached_session_id()
+            for sess in session_info.get('sessions', []):
+                if sess.get('ppid') == current_ppid:
+                    fg_port = sess.get('foreground')
+                    if fg_port:
+                        was_foreground = (fg_port == port)
+                    else:
+                        bg_ports = sess.get('backgrounds', [])
+                        was_foreground = not (port and port in bg_ports)
+                    break
+        except Exception:
+            pass
+        try:
+            client.send_command('disconnect_port', port=port)
+        except Exception:
+            pass
+    disconnected_at = time.monotonic()
+    deadline = disconnected_at + _RECONNECT_BUDGET
+    
+    if on_status:
+        on_status("Reconnecting...")
+    try:
+        if not AgentClient.is_agent_running(port=agent_port):
+            AgentClient.start_agent(port=agent_port)
+    except Exception as e:
+        return False, e
+    # The device node can outlive the reset on POSIX, so its presence alone does not mean ready.
+    settle = disconnected_at + _RECONNECT_SETTLE - time.monotonic()
+    if settle > 0:
+        time.sleep(settle)
+    _wait_for_serial_port(port, timeout=max(0.0, deadline - time.monotonic()))
+    
+    if on_status:
+        on_status("Verifying connection...")
+    last_error = None
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            with AgentClient(port=agent_port, device_port=port if port else None) as client:
+                resp = client.send_command('session_setup', port=port,
+                                           core=core, device=device, as_foreground=was_foreground)
+            _invalidate_ensured()
+            if resp.get('connected'):
+                STATE.core = resp.get('core', core)
+                STATE.device = resp.get('device', device)
+                STATE.device_root_fs = resp.get('device_root_fs', STATE.device_root_fs)
+                set_global_context(STATE.core, STATE.device, STATE.version, STATE.device_root_fs, STATE.device_path)
+                return True, None
+            last_error = RuntimeError(f"Reconnect failed: {resp}")
+        except Exception as e:
+            last_error = e
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(0.25 * 2 ** (attempts - 1), _RECONNECT_MAX_DELAY, remaining))
+    
+    return False, last_error or RuntimeError(f"Reconnect failed after {attempts} attempts")
+
+
+_INIT_HELP = """\
 Completely reset device: format filesystem and install all libraries.
 
 [bold cyan]Usage:[/bold cyan]
   replx init
+  replx init -f               [dim]# Format even if already empty[/dim]
 
 [bold cyan]What happens:[/bold cyan]
-  1. [yellow]Format:[/yellow] Erases entire filesystem
+  1. [yellow]Format:[/yellow] Erases entire filesystem (skipped if already empty)
   2. [yellow]Install:[/yellow] Installs core libraries for your chip
   3. [yellow]Install:[/yellow] Installs device-specific libraries
 
@@ -1149,16 +1385,23 @@ Completely reset device: format filesystem and install all libraries.
   replx format                [dim]# Just erase (no install)[/dim]
   replx pkg update core.all   [dim]# Just install core (no format)[/dim]
   replx pkg update device.all [dim]# Just install device (no format)[/dim]"""
-        OutputHelper.print_panel(help_text, title="init", border_style="help")
-        console.print()
+
+
+@app.command(rich_help_panel="Device Management")
+def init(
+    force: bool = typer.Option(False, "--force", "-f", help="Format even if the filesystem is already empty"),
+    show_help: bool = typer.Option(False, "--help", "-h", is_eager=True, hidden=True)
+):
+    if show_help:
+        OutputHelper.print_panel(_INIT_HELP, title="init", border_style="help")
+        _CONSOLE.print()
         raise typer.Exit()
     
     _ensure_connected()
     
-    StoreManager.ensure_home_store()
+    store_root = StoreManager.pkg_root()
     
-    meta_path = StoreManager.local_meta_path()
-    if not os.path.isfile(meta_path):
+    if not os.path.isfile(StoreManager.local_meta_path()):
         OutputHelper.print_panel(
             "[red]Local store is not ready.[/red]\n\n"
             "The package registry is missing. Please run:\n"
@@ -1169,7 +1412,7 @@ Completely reset device: format filesystem and install all libraries.
         )
         raise typer.Exit(1)
     
-    core_src = os.path.join(StoreManager.pkg_root(), "core", STATE.core, "src")
+    core_src = os.path.join(store_root, "core", STATE.core, "src")
     if not os.path.isdir(core_src):
         OutputHelper.print_panel(
             f"[red]Core library for '{STATE.core}' not found.[/red]\n\n"
@@ -1181,30 +1424,38 @@ Completely reset device: format filesystem and install all libraries.
         )
         raise typer.Exit(1)
     
-    console = Console(width=CONSOLE_WIDTH)
+    from rich.live import Live
+    
+    status = ["Formatting file system..."]
     
-    def make_format_panel(message: str, title: str = "Formatting") -> Panel:
-        spinner = Spinner("dots", text=f" {message}")
-        return Panel(spinner, title=title, title_align="left", border_style=OutputHelper._resolve_category_color('data'),
-                     box=get_panel_box(), width=CONSOLE_WIDTH)
+    def set_status(message: str):
+        if message != status[0]:
+            status[0] = message
+            live.update(_format_panel(message))
+    
+    install_stats = {}
+    phase = "format"
     
     try:
-        with Live(make_format_panel("Formatting file system..."), 
-                  console=console, refresh_per_second=10) as live:
+        # One Live surface for format, reconnect and install so the display is not torn down in between.
+        with Live(_format_panel(status[0]), 
+                  console=_CONSOLE, refresh_per_second=10) as live:
             client = _create_agent_client()
-            result = client.send_command('format')
-            format_result = result.get('formatted', True) if result else None
-            
-            if not format_result:
-                live.stop()
-                OutputHelper.print_panel(
-                    "Initialization failed: Format operation was unsuccessful.",
-                    title="Initialization Failed",
-                    border_style="error"
-                )
-                return False
+            skip_format = not force and _device_fs_is_empty(client)
+            if not skip_format:
+                result = client.send_command('format')
+                format_result = result.get('formatted', True) if result else None
+                
+                if not format_result:
+                    live.stop()
+                    OutputHelper.print_panel(
+                        "Initialization failed: Format operation was unsuccessful.",
+                        title="Initialization Failed",
+                        border_style="error"
+                    )
+                    return False
             
-            live.update(make_format_panel("Reconnecting to device..."))
+            set_status("Reconnecting to device...")
             
             global_opts = _get_global_options()
             explicit_port = global_opts.get('port')
@@ -1218,95 +1469,42 @@ Completely reset device: format filesystem and install all libraries.
             core = conn.get('core') or STATE.core
             device = conn.get('device') or STATE.device
             
-            client = AgentClient(port=agent_port)
+            if core == "EFR32MG" and not skip_format:
+                ok, error = _post_format_reconnect(agent_port, port, core, device, on_status=set_status)
+                if not ok:
+                    raise error
             
-            needs_reconnect = (core == "EFR32MG")
+            if skip_format:
+                format_msg = f"[green]\u2713[/green] File system on [bright_yellow]{STATE.device}[/bright_yellow] is already empty."
+            else:
+                format_msg = f"[green]\u2713[/green] File system on [bright_yellow]{STATE.device}[/bright_yellow] formatted successfully."
+            format_done = Panel(
+                format_msg,
+                title="Format Skipped" if skip_format else "Format Complete", title_align="left",
+                border_style=OutputHelper._resolve_category_color('success'),
+                box=get_panel_box(), width=CONSOLE_WIDTH
+            )
             
-            if needs_reconnect:
-                was_foreground = True
-                try:
-                    session_info = client.send_command('session_info', timeout=1.0)
-                    current_ppid = get_cached_session_id()
-                    for sess in session_info.get('sessions', []):
-                        if sess.get('ppid') == current_ppid:
-                            fg_port = sess.get('foreground')
-                            if fg_port:
-                                was_foreground = (fg_port == port)
-                            else:
-                                bg_ports = sess.get('backgrounds', [])
-                                was_foreground = not (port and port in bg_ports)
-                            break
-                except Exception:
-                    pass
-                try:
-                    client.send_command('disconnect_port', port=port)
-                except Exception:
-                    pass
-                
-                time.sleep(3.0)
-                
-                live.update(make_format_panel("Reconnecting..."))
-                if not AgentClient.is_agent_running(port=agent_port):
-                    AgentClient.start_agent(port=agent_port)
-                    time.sleep(0.5)
-                
-                live.update(make_format_panel("Verifying connection..."))
-                last_error = None
-                for attempt in range(3):
-                    try:
-                        client = AgentClient(port=agent_port, device_port=port if port else None)
-                        resp = client.send_command('session_setup', port=port,
-                                                   core=core, device=device, as_foreground=was_foreground)
-                        if resp.get('connected'):
-                            STATE.core = resp.get('core', core)
-                            STATE.device = resp.get('device', device)
-                            STATE.device_root_fs = resp.get('device_root_fs', STATE.device_root_fs)
-                            set_global_context(STATE.core, STATE.device, STATE.version, STATE.device_root_fs, STATE.device_path)
-                            break
-                        last_error = RuntimeError(f"Reconnect failed: {resp}")
-                    except Exception as e:
-                        last_error = e
-                    
-                    if attempt < 2:
-                        time.sleep(2.0)
-                else:
-                    raise last_error or RuntimeError("Reconnect failed after 3 attempts")
+            phase = "install"
+            specs_to_install = ["core.all"]
+
+            from .package import _install_spec_internal
             
-            live.update(Panel(
-                f"[green]\u2713[/green] File system on [bright_yellow]{STATE.device}[/bright_yellow] formatted successfully.",
-                title="Format Complete", title_align="left", border_style=OutputHelper._resolve_category_color('success'),
+            dev_src = os.path.join(store_root, "device", device_name_to_path(STATE.device), "src")
+            if os.path.isdir(dev_src):
+                specs_to_install.append("device.all")
+            
+            def show_install(panel):
+                live.update(Group(format_done, panel))
+            
+            show_install(Panel(
+                "Preparing installation...",
+                title="Installing", title_align="left", border_style=OutputHelper._resolve_category_color('data'),
                 box=get_panel_box(), width=CONSOLE_WIDTH
             ))
-    
-    except Exception as e:
-        OutputHelper.print_panel(
-            f"Format failed: [red]{e}[/red]",
-            title="Format Failed",
-            border_style="error"
-        )
-        return False
-    
-    install_stats = {}
-    
-    try:
-        specs_to_install = ["core.all"]
-
-        from .package import _install_spec_internal
-        
-        dev_src = os.path.join(StoreManager.pkg_root(), "device", device_name_to_path(STATE.device), "src")
-        if os.path.isdir(dev_src):
-            specs_to_install.append("device.all")
-        
-        from rich.panel import Panel as RichPanel
-        initial_panel = RichPanel(
-            "Preparing installation...",
-            title="Installing", title_align="left", border_style=OutputHelper._resolve_category_color('data'),
-            box=get_panel_box(), width=CONSOLE_WIDTH
-        )
-        
-        with Live(initial_panel, console=console, refresh_per_second=10) as live:
+            
             for spec_item in specs_to_install:
-                result = _install_spec_internal(spec_item, live=live, update_callback=lambda p: live.update(p))
+                result = _install_spec_internal(spec_item, live=live, update_callback=show_install)
                 if result:
                     install_stats[spec_item] = result
             
@@ -1317,18 +1515,25 @@ Completely reset device: format filesystem and install all libraries.
                     summary_parts.append(f"🔧 {spec_key} {stats['files']} file(s) {OutputHelper.format_bytes(stats['bytes'])}")
             
             summary_line = "    ".join(summary_parts)
-            live.update(RichPanel(
+            show_install(Panel(
                 summary_line,
                 title="Installation Complete", title_align="left", border_style=OutputHelper._resolve_category_color('success'),
                 box=get_panel_box(), width=CONSOLE_WIDTH
             ))
-        
+    
     except Exception as e:
-        OutputHelper.print_panel(
-            f"Initialization failed during install: [red]{e}[/red]",
-            title="Initialization Failed",
-            border_style="error"
-        )
+        if phase == "format":
+            OutputHelper.print_panel(
+                f"Format failed: [red]{e}[/red]",
+                title="Format Failed",
+                border_style="error"
+            )
+        else:
+            OutputHelper.print_panel(
+                f"Initialization failed during install: [red]{e}[/red]",
+                title="Initialization Failed",
+                border_style="error"
+            )
         return False
     
     OutputHelper.print_panel(
@@ -1,17 +1,60 @@
 import os
+import re
 import socket
 import sys
 import json
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
 from replx.utils.constants import AGENT_HOST, DEFAULT_AGENT_PORT, MIN_AGENT_PORT, MAX_AGENT_PORT
 
 _write_port_lock = threading.Lock()
 
+# Parsed .replx contents per path, stamped with (mtime_ns, size); cleared on write.
+# Entries are read-only views shared by every caller.
+_READ_CACHE: dict[str, tuple[tuple[int, int], MappingProxyType]] = {}
 
-@dataclass
+_CONNECTION_KEYS = ('VERSION', 'CORE', 'DEVICE', 'MANUFACTURER', 'SERIAL_PORT')
+_CONNECTION_FIELDS = {sys.intern(k): k.lower() for k in _CONNECTION_KEYS}
+
+# One match per "[section]" or "KEY=value" line; blank lines and '#' comments never match.
+_INI_LINE_RE = re.compile(
+    r'^[ \t]*(?:\[(?P<section>.*)\]|(?P<key>[^#\[\s][^=\n]*)=(?P<value>.*?))[ \t]*$',
+    re.MULTILINE,
+)
+
+
+@lru_cache(maxsize=8)
+def _scan_vscode_ancestors(start: str) -> tuple[Optional[str], Optional[str]]:
+    """Walk up from ``start`` once; return (nearest .vscode/.replx, nearest .vscode dir)."""
+    root = os.path.abspath(os.sep)
+    env_path = None
+    vscode_dir = None
+    
+    current = start
+    visited = set()
+    while current not in visited:
+        visited.add(current)
+        candidate = os.path.join(current, ".vscode")
+        if os.path.isdir(candidate):
+            if vscode_dir is None:
+                vscode_dir = candidate
+            replx_path = os.path.join(candidate, ".replx")
+            if os.path.exists(replx_path):
+                env_path = replx_path
+                break
+        parent = os.path.dirname(current)
+        if parent == current or parent == root:
+            break
+        current = parent
+    return env_path, vscode_dir
+
+
+@dataclass(slots=True)
 class RuntimeState:
     version: str = "?"
     core: str = ""
@@ -26,131 +69,125 @@ STATE = RuntimeState()
 
 class GlobalOptions:
     
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._port = None
-        return cls._instance
+    __slots__ = ('port',)
     
-    @property
-    def port(self) -> Optional[str]:
-        return self._port
-    
-    @port.setter
-    def port(self, value: Optional[str]):
-        self._port = value
+    def __init__(self):
+        self.port: Optional[str] = None
     
     def set(self, port: str = None):
-        self._port = port
+        self.port = port
     
     def get(self) -> Dict[str, Any]:
         return {
-            'port': self._port,
+            'port': self.port,
         }
     
     def clear(self):
-        self._port = None
+        self.port = None
 
 
 GLOBAL_OPTIONS = GlobalOptions()
 
 class ConfigManager:
    
+    @staticmethod
+    def invalidate_paths():
+        _scan_vscode_ancestors.cache_clear()
+    
     @staticmethod
     def find_env_file() -> Optional[str]:
-        current = os.path.realpath(os.getcwd())
-        root = os.path.abspath(os.sep)
-        
-        visited = set()
-        while current not in visited:
-            visited.add(current)
-            env_path = os.path.join(current, ".vscode", ".replx")
-            if os.path.exists(env_path):
-                return env_path
-            parent = os.path.dirname(current)
-            if parent == current or parent == root:
-                break
-            current = parent
-        return None
+        cwd = os.path.realpath(os.getcwd())
+        env_path = _scan_vscode_ancestors(cwd)[0]
+        if env_path is not None and not os.path.isfile(env_path):
+            # .replx was removed since the walk was cached; rescan instead of returning a dead path.
+            ConfigManager.invalidate_paths()
+            env_path = _scan_vscode_ancestors(cwd)[0]
+        return env_path
     
     @staticmethod
     def find_or_create_vscode_dir() -> str:
         current = os.path.realpath(os.getcwd())
-        root = os.path.abspath(os.sep)
-        
-        search_dir = current
-        visited = set()
-        while search_dir not in visited:
-            visited.add(search_dir)
-            vscode_dir = os.path.join(search_dir, ".vscode")
-            if os.path.isdir(vscode_dir):
-                return vscode_dir
-            parent = os.path.dirname(search_dir)
-            if parent == search_dir or parent == root:
-                break
-            search_dir = parent
+        vscode_dir = _scan_vscode_ancestors(current)[1]
+        if vscode_dir is not None:
+            return vscode_dir
         
         vscode_dir = os.path.join(current, ".vscode")
         os.makedirs(vscode_dir, exist_ok=True)
+        ConfigManager.invalidate_paths()
         return vscode_dir
     
     @staticmethod
-    def read(env_path: str) -> dict:
+    def _freeze(result: dict) -> MappingProxyType:
+        return MappingProxyType({
+            'connections': MappingProxyType({
+                k: MappingProxyType(v) for k, v in result['connections'].items()
+            }),
+            'default': result['default'],
+            'theme': result['theme'],
+        })
+    
+    @staticmethod
+    def read_mutable(env_path: str) -> dict:
+        env_data = ConfigManager.read(env_path)
+        return {
+            'connections': {k: dict(v) for k, v in env_data['connections'].items()},
+            'default': env_data['default'],
+            'theme': env_data['theme'],
+        }
+    
+    @staticmethod
+    def read(env_path: str) -> MappingProxyType:
         result = {
             'connections': {},
             'default': None,
             'theme': None,
         }
         
-        if not os.path.exists(env_path):
-            return result
+        try:
+            st = os.stat(env_path)
+        except OSError:
+            return ConfigManager._freeze(result)
+        
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _READ_CACHE.get(env_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
         
         try:
             with open(env_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            current_section = None
+            connections = result['connections']
+            section = None
+            conn = None
             
-            for line in content.splitlines():
-                line = line.strip()
-                
-                if not line or line.startswith('#'):
+            for m in _INI_LINE_RE.finditer(content):
+                name = m.group('section')
+                if name is not None:
+                    section = name.strip()
+                    conn = None if section.upper() == 'DEFAULT' else connections.setdefault(section, {})
                     continue
                 
-                if line.startswith('[') and line.endswith(']'):
-                    current_section = line[1:-1].strip()
-                    if current_section.upper() != 'DEFAULT':
-                        result['connections'][current_section] = {}
+                if section is None:
                     continue
                 
-                if '=' in line and current_section:
-                    key, value = line.split('=', 1)
-                    key = key.strip().upper()
-                    value = value.strip()
-                    
-                    if current_section.upper() == 'DEFAULT':
-                        if key == 'CONNECTION':
-                            result['default'] = value
-                        elif key == 'THEME':
-                            result['theme'] = value
-                    else:
-                        conn = result['connections'][current_section]
-                        if key == 'VERSION':
-                            conn['version'] = value
-                        elif key == 'CORE':
-                            conn['core'] = value
-                        elif key == 'DEVICE':
-                            conn['device'] = value
-                        elif key == 'MANUFACTURER':
-                            conn['manufacturer'] = value
-                        elif key == 'SERIAL_PORT':
-                            conn['serial_port'] = value
+                key = m.group('key').strip().upper()
+                value = m.group('value').strip()
+                if conn is None:
+                    if key == 'CONNECTION':
+                        result['default'] = value
+                    elif key == 'THEME':
+                        result['theme'] = value
+                else:
+                    field = _CONNECTION_FIELDS.get(key)
+                    if field:
+                        conn[field] = value
             
-            return result
+            frozen = ConfigManager._freeze(result)
+            _READ_CACHE[env_path] = (stamp, frozen)
+            return frozen
         except Exception:
-            return result
+            return ConfigManager._freeze(result)
     
     @staticmethod
     def write(env_path: str, connections: dict, default: Optional[str] = None, theme: Optional[str] = None):
@@ -158,28 +195,27 @@ class ConfigManager:
         
         for conn_key, conn_data in connections.items():
             lines.append(f'[{conn_key}]')
-            if conn_data.get('version'):
-                lines.append(f"VERSION={conn_data['version']}")
-            if conn_data.get('core'):
-                lines.append(f"CORE={conn_data['core']}")
-            if conn_data.get('device'):
-                lines.append(f"DEVICE={conn_data['device']}")
-            if conn_data.get('manufacturer'):
-                lines.append(f"MANUFACTURER={conn_data['manufacturer']}")
-            if conn_data.get('serial_port'):
-                lines.append(f"SERIAL_PORT={conn_data['serial_port']}")
+            for k in _CONNECTION_KEYS:
+                value = conn_data.get(k.lower())
+                if value:
+                    lines.append(f'{k}={value}')
             lines.append('')
         
         if default:
             lines.append('[DEFAULT]')
-            if default:
-                lines.append(f'CONNECTION={default}')
+            lines.append(f'CONNECTION={default}')
             lines.append('')
         
+        buf = '\n'.join(lines).encode('utf-8')
+        
+        _READ_CACHE.clear()
         os.makedirs(os.path.dirname(env_path), exist_ok=True)
         
-        with open(env_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        tmp_path = f'{env_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(buf)
+        os.replace(tmp_path, env_path)
+        ConfigManager.invalidate_paths()
     
     @staticmethod
     def get_connection(env_path: str, connection: str) -> Optional[dict]:
@@ -228,7 +264,7 @@ class ConfigManager:
 
         desired_key = _resolve_os_serial_port_name(connection)
 
-        env_data = ConfigManager.read(env_path)
+        env_data = ConfigManager.read_mutable(env_path)
         
         existing_key = None
         for key in env_data.get('connections', {}):
@@ -353,13 +389,24 @@ class AgentPortManager:
 
         return min(running_ports)
 
+    @staticmethod
+    def _probe_agent_ports(ports: list[int], fresh: bool = False) -> list[int]:
+        from .agent.client import AgentClient
+
+        if len(ports) <= 1:
+            return [port for port in ports if AgentClient.is_agent_running(port=port, fresh=fresh)]
+
+        # Each probe waits out its own UDP timeout; run them side by side.
+        with ThreadPoolExecutor(max_workers=min(8, len(ports))) as executor:
+            alive = list(executor.map(lambda port: AgentClient.is_agent_running(port=port, fresh=fresh), ports))
+        return [port for port, ok in zip(ports, alive) if ok]
+
     _singleton_cache: Optional[int] = None
     _singleton_cache_miss: bool = False
+    _available_port_cache: Optional[int] = None
 
     @staticmethod
     def _ensure_singleton_running_agent(preferred_port: Optional[int] = None) -> Optional[int]:
-        from .agent.client import AgentClient
-
         # Process-level cache: ``_ensure_connected`` calls this twice in the same
         # CLI invocation. The set of running agents cannot change between those
         # back-to-back calls, so reuse the prior result.
@@ -368,6 +415,8 @@ class AgentPortManager:
         if AgentPortManager._singleton_cache_miss:
             return None
 
+        from .agent.client import AgentClient
+
         # Fast path: if the preferred / registered / default port already responds
         # to a ping, skip the slow scan-and-cleanup phase. Stale agent processes
         # left from previous sessions can otherwise add ~0.3s per dead candidate
@@ -384,10 +433,9 @@ class AgentPortManager:
                     AgentPortManager._write_registered_port(candidate)
                 return candidate
 
-        running_ports = []
-        for port in AgentPortManager._get_candidate_agent_ports(preferred_port=preferred_port):
-            if AgentClient.is_agent_running(port=port):
-                running_ports.append(port)
+        running_ports = AgentPortManager._probe_agent_ports(
+            AgentPortManager._get_candidate_agent_ports(preferred_port=preferred_port)
+        )
 
         if not running_ports:
             AgentPortManager._singleton_cache_miss = True
@@ -408,10 +456,7 @@ class AgentPortManager:
             if AgentClient.is_agent_running(port=port):
                 AgentPortManager._kill_agent_process_by_port(port)
 
-        remaining_ports = []
-        for port in running_ports:
-            if AgentClient.is_agent_running(port=port):
-                remaining_ports.append(port)
+        remaining_ports = AgentPortManager._probe_agent_ports(running_ports, fresh=True)
 
         extra_ports = [port for port in remaining_ports if port != primary_port]
         if extra_ports:
@@ -712,6 +757,17 @@ class AgentPortManager:
     
     @staticmethod
     def find_available_port(env_path: str = None) -> int:
+        # The chosen port stays the agent's port for the rest of the process, whether
+        # or not an agent gets started on it, so later resolutions skip the bind probes.
+        if AgentPortManager._available_port_cache is not None:
+            return AgentPortManager._available_port_cache
+
+        port = AgentPortManager._pick_available_port()
+        AgentPortManager._available_port_cache = port
+        return port
+
+    @staticmethod
+    def _pick_available_port() -> int:
         registered_port = AgentPortManager._read_registered_port()
         running_port = AgentPortManager._ensure_singleton_running_agent(preferred_port=registered_port)
         if running_port is not None:
@@ -743,8 +799,6 @@ class AgentPortManager:
 
     @staticmethod
     def find_agent_for_connection(port: str, env_path: str = None, preferred_port: int = None) -> Optional[int]:
-        from .agent.client import AgentClient
-
         target_port = AgentPortManager._normalize_connection_port(port)
         if not target_port:
             return None
@@ -753,6 +807,8 @@ class AgentPortManager:
         if agent_port is None:
             return None
 
+        from .agent.client import AgentClient
+
         try:
             with AgentClient(port=agent_port) as client:
                 session_info = client.send_command('session_info', timeout=1.0)
@@ -801,30 +857,32 @@ class ConnectionResolver:
     
     @staticmethod
     def _resolve_from_session(env_path: str = None) -> Optional[dict]:
-        from .agent.client import AgentClient, get_cached_session_id
-
-        ppid = get_cached_session_id()
         agent_port = AgentPortManager.find_running_agent(env_path)
         if agent_port is None:
             return None
 
+        from .agent.client import AgentClient, get_cached_session_id
+
+        ppid = get_cached_session_id()
+
         try:
             with AgentClient(port=agent_port) as client:
                 session_info = client.send_command('session_info', timeout=1.0)
 
-            for session in session_info.get('sessions', []):
-                if session.get('ppid') == ppid and session.get('foreground'):
-                    fg_port = session['foreground']
-
-                    for conn in session_info.get('connections', []):
-                        if conn.get('port') == fg_port and conn.get('connected'):
-                            return {
-                                'connection': fg_port,
-                                'agent_port': agent_port,
-                                'core': conn.get('core'),
-                                'device': conn.get('device'),
-                                'source': 'session'
-                            }
+            sessions_by_ppid = {s.get('ppid'): s for s in session_info.get('sessions', [])}
+            session = sessions_by_ppid.get(ppid)
+            fg_port = session.get('foreground') if session else None
+            if fg_port:
+                connections_by_port = {c.get('port'): c for c in session_info.get('connections', [])}
+                conn = connections_by_port.get(fg_port)
+                if conn and conn.get('connected'):
+                    return {
+                        'connection': fg_port,
+                        'agent_port': agent_port,
+                        'core': conn.get('core'),
+                        'device': conn.get('device'),
+                        'source': 'session'
+                    }
         except Exception:
             return None
         
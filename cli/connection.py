@@ -1,10 +1,11 @@
 import os
-import sys
 import threading
 from typing import Optional
 
 import typer
+from rich.text import Text
 
+from replx.terminal import IS_WINDOWS
 from .agent.client import AgentClient, get_cached_session_id
 from .helpers import OutputHelper, set_global_context
 from .config import (
@@ -18,6 +19,13 @@ from .config import (
     AgentPortManager,
 )
 
+
+def _port_norm(p: Optional[str]) -> str:
+    if not p:
+        return ""
+    return p.upper() if IS_WINDOWS else p
+
+
 def _print_connect_info(
     port: str,
     version: str,
@@ -51,6 +59,15 @@ def _is_transport_connection_error(e: Exception) -> bool:
     ))
 
 
+_CONNECTION_ERROR_HINT = Text.assemble(
+    "Please check:\n"
+    "  • Device is powered on and connected\n"
+    "  • Serial cable is properly attached\n"
+    "  • Port is not in use by another program (PuTTY, Arduino IDE, etc.)\n\n",
+    ("Run 'replx --port PORT setup' to reconfigure if needed.", "dim"),
+)
+
+
 def _handle_connection_error(e: Exception, port: str = None, stop_agent: bool = False, agent_port: int = None):
     conn_info = OutputHelper.format_port(port) if port else "unknown"
     
@@ -63,26 +80,15 @@ def _handle_connection_error(e: Exception, port: str = None, stop_agent: bool =
         except Exception:
             pass
     
+    error_msg = Text.assemble(
+        "Connection failure on configured device (", (conn_info, "bright_blue"), ").\n\n"
+    )
     error_detail = str(e)
     if error_detail:
-        error_msg = (
-            f"Connection failure on configured device ([bright_blue]{conn_info}[/bright_blue]).\n\n"
-            f"[yellow]Error details:[/yellow] {error_detail}\n\n"
-            "Please check:\n"
-            "  • Device is powered on and connected\n"
-            "  • Serial cable is properly attached\n"
-            "  • Port is not in use by another program (PuTTY, Arduino IDE, etc.)\n\n"
-            "[dim]Run 'replx --port PORT setup' to reconfigure if needed.[/dim]"
-        )
-    else:
-        error_msg = (
-            f"Connection failure on configured device ([bright_blue]{conn_info}[/bright_blue]).\n\n"
-            "Please check:\n"
-            "  • Device is powered on and connected\n"
-            "  • Serial cable is properly attached\n"
-            "  • Port is not in use by another program (PuTTY, Arduino IDE, etc.)\n\n"
-            "[dim]Run 'replx --port PORT setup' to reconfigure if needed.[/dim]"
-        )
+        # Appended as plain text so brackets in the error are never read as markup.
+        error_msg.append("Error details:", style="yellow")
+        error_msg.append(f" {error_detail}\n\n")
+    error_msg.append_text(_CONNECTION_ERROR_HINT)
     
     OutputHelper.print_panel(
         error_msg,
@@ -91,7 +97,51 @@ def _handle_connection_error(e: Exception, port: str = None, stop_agent: bool =
     )
 
 
+def _session_setup(client: AgentClient, conn: dict, *, as_foreground: bool,
+                   local_default: Optional[str] = None) -> dict:
+    result = client.send_command(
+        'session_setup',
+        port=conn['connection'],
+        core=conn.get('core') or "RP2350",
+        device=conn.get('device'),
+        as_foreground=as_foreground,
+        set_default=False,
+        local_default=local_default,
+    )
+    
+    if result.get('switched_from'):
+        OutputHelper.print_panel(
+            f"Auto-disconnected [yellow]{result['switched_from']}[/yellow] (same board)",
+            title="Connection Switched",
+            border_style="neutral"
+        )
+    return result
+
+
+# Status returned by _ensure_connected, keyed by (explicit port, .replx path, default connection).
+_ENSURED_CACHE: dict[tuple, dict] = {}
+
+
+def _invalidate_ensured() -> None:
+    _ENSURED_CACHE.clear()
+
+
 def _ensure_connected(ctx: typer.Context = None) -> dict:
+    env_path = _find_env_file()
+    key = (
+        _get_global_options().get('port'),
+        env_path,
+        _get_default_connection(env_path) if env_path else None,
+    )
+    status = _ENSURED_CACHE.get(key)
+    if status is None:
+        status = _ensure_connected_uncached(ctx)
+        _ENSURED_CACHE[key] = status
+    # Shallow copy: a caller that edits its status must not change what later callers see.
+    return dict(status)
+
+
+def _ensure_connected_uncached(ctx: typer.Context = None) -> dict:
     global_opts = _get_global_options()
     explicit_port = global_opts.get('port')
 
@@ -106,6 +156,14 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
             _cached_agent_port = agent_port
 
     target_port = explicit_port or default_conn
+    resolved = []
+    
+    def _target_conn() -> Optional[dict]:
+        # Every rule below resolves the same target; do the lookup at most once and only when needed.
+        if not resolved:
+            resolved.append(_resolve_connection(target_port))
+        return resolved[0]
+    
     if target_port:
         running_agent_port = _find_agent_for_connection(target_port, env_path, preferred_port=agent_port)
         if running_agent_port is not None:
@@ -126,11 +184,8 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
                     border_style="error"
                 )
                 raise typer.Exit(1)
-            
-            conn = _resolve_connection(default_conn)
-        else:
-            conn = _resolve_connection(explicit_port)
         
+        conn = _target_conn()
         if not conn:
             OutputHelper.print_panel(
                 "No connection configuration found.\n\n"
@@ -140,38 +195,22 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
             )
             raise typer.Exit(1)
         
+        client = AgentClient(port=agent_port)
         try:
             AgentClient.start_agent(port=agent_port)
             AgentPortManager._singleton_cache = agent_port
             AgentPortManager._singleton_cache_miss = False
 
             if default_conn:
-                with AgentClient(port=agent_port) as client:
-                    client.send_command('set_default', port=default_conn, timeout=1.0)
+                client.send_command('set_default', port=default_conn, timeout=1.0)
         except Exception as e:
+            client.disconnect()
             OutputHelper.print_panel(f"Failed to start agent: {str(e)}", title="Agent Error", title_align="left", border_style="error")
             raise typer.Exit(1)
         
         try:
             port_arg = conn['connection']
-            
-            with AgentClient(port=agent_port) as client:
-                result = client.send_command(
-                    'session_setup',
-                    port=port_arg,
-                    core=conn.get('core') or "RP2350",
-                    device=conn.get('device'),
-                    as_foreground=True,
-                    set_default=False,
-                    local_default=default_conn,
-                )
-            
-            if result.get('switched_from'):
-                OutputHelper.print_panel(
-                    f"Auto-disconnected [yellow]{result['switched_from']}[/yellow] (same board)",
-                    title="Connection Switched",
-                    border_style="neutral"
-                )
+            result = _session_setup(client, conn, as_foreground=True, local_default=default_conn)
             
             STATE.core = result.get('core', conn.get('core', ''))
             STATE.device = result.get('device', conn.get('device', 'unknown'))
@@ -189,6 +228,7 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
             )
             
         except Exception as e:
+            client.disconnect()
             _handle_connection_error(e, port=port_arg, stop_agent=True, agent_port=agent_port)
             raise typer.Exit(1)
         
@@ -206,31 +246,26 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
         
         set_global_context(STATE.core, STATE.device, STATE.version, STATE.device_root_fs, STATE.device_path)
         
-        with AgentClient(port=agent_port, device_port=explicit_port) as client:
-            status = client.send_command('status')
-        return status
+        with client:
+            return client.send_command('status', port=explicit_port)
     
+    # One socket for every request below; closed when _ensure_connected returns.
+    client = AgentClient(port=agent_port)
     try:
-        with AgentClient(port=agent_port) as client:
+        try:
+            session_info = client.send_command('session_status')
+            status = session_info['status']
+        except RuntimeError as e:
+            # Agent started by an older release; fall back to the two separate queries.
+            if 'Unknown command' not in str(e):
+                raise
             status = client.send_command('status')
             session_info = client.send_command('session_info', timeout=1.0)
 
-        def _port_norm(p: Optional[str]) -> str:
-            if not p:
-                return ""
-            if sys.platform.startswith("win"):
-                return p.upper()
-            return p
-        
-        current_ppid = get_cached_session_id()
-        current_fg = None
-        current_bgs = []
-        
-        for session in session_info.get('sessions', []):
-            if session.get('ppid') == current_ppid:
-                current_fg = session.get('foreground')
-                current_bgs = session.get('backgrounds', [])
-                break
+        sessions_by_ppid = {s.get('ppid'): s for s in session_info.get('sessions', [])}
+        current_session = sessions_by_ppid.get(get_cached_session_id()) or {}
+        current_fg = current_session.get('foreground')
+        current_bgs = current_session.get('backgrounds', [])
         
         if not current_fg:
             if not explicit_port:
@@ -244,7 +279,7 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
                     )
                     raise typer.Exit(1)
                 
-                fg_conn = _resolve_connection(default_conn)
+                fg_conn = _target_conn()
                 if not fg_conn:
                     OutputHelper.print_panel(
                         "No connection available.\n\n"
@@ -254,25 +289,7 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
                     )
                     raise typer.Exit(1)
                 
-                port_arg = fg_conn['connection']
-                
-                with AgentClient(port=agent_port) as client:
-                    result = client.send_command(
-                        'session_setup',
-                        port=port_arg,
-                        core=fg_conn.get('core') or "RP2350",
-                        device=fg_conn.get('device'),
-                        as_foreground=True,
-                        set_default=False,
-                        local_default=default_conn,
-                    )
-                
-                if result.get('switched_from'):
-                    OutputHelper.print_panel(
-                        f"Auto-disconnected [yellow]{result['switched_from']}[/yellow] (same board)",
-                        title="Connection Switched",
-                        border_style="neutral"
-                    )
+                result = _session_setup(client, fg_conn, as_foreground=True, local_default=default_conn)
                 
                 _print_connect_info(
                     fg_conn['connection'],
@@ -287,7 +304,7 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
                 status['connected'] = True
                 current_fg = fg_conn['connection']
             else:
-                fg_conn = _resolve_connection(explicit_port)
+                fg_conn = _target_conn()
                 if not fg_conn:
                     OutputHelper.print_panel(
                         "No connection configuration found.\n\n"
@@ -297,25 +314,7 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
                     )
                     raise typer.Exit(1)
                 
-                port_arg = fg_conn['connection']
-                
-                with AgentClient(port=agent_port) as client:
-                    result = client.send_command(
-                        'session_setup',
-                        port=port_arg,
-                        core=fg_conn.get('core') or "RP2350",
-                        device=fg_conn.get('device'),
-                        as_foreground=True,
-                        set_default=False,
-                        local_default=default_conn,
-                    )
-                
-                if result.get('switched_from'):
-                    OutputHelper.print_panel(
-                        f"Auto-disconnected [yellow]{result['switched_from']}[/yellow] (same board)",
-                        title="Connection Switched",
-                        border_style="neutral"
-                    )
+                result = _session_setup(client, fg_conn, as_foreground=True, local_default=default_conn)
                 
                 if fg_conn.get('source') == 'global':
                     if not env_path:
@@ -358,23 +357,20 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
             
             return status
         
+        # The status fetched above describes the foreground; refetch only if it is not the explicit port.
+        status_fresh = False
         if explicit_port:
-            explicit_conn = _resolve_connection(explicit_port)
+            explicit_conn = _target_conn()
             if explicit_conn:
-                explicit_key = explicit_conn['connection']
-                if _port_norm(explicit_key) != _port_norm(current_fg) and _port_norm(explicit_key) not in [_port_norm(bg) for bg in current_bgs]:
+                explicit_key = _port_norm(explicit_conn['connection'])
+                status_fresh = explicit_key == _port_norm(current_fg)
+                attached = {_port_norm(current_fg)}
+                attached.update(_port_norm(bg) for bg in current_bgs)
+                if explicit_key not in attached:
                     port_arg = explicit_conn['connection']
                     
                     try:
-                        with AgentClient(port=agent_port) as client:
-                            bg_result = client.send_command(
-                                'session_setup',
-                                port=port_arg,
-                                core=explicit_conn.get('core') or "RP2350",
-                                device=explicit_conn.get('device'),
-                                as_foreground=False,  # bg로 추가
-                                set_default=False,
-                            )
+                        bg_result = _session_setup(client, explicit_conn, as_foreground=False)
 
                         if bg_result and not bg_result.get('existing', False):
                             _print_connect_info(
@@ -385,13 +381,6 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
                                 bg_result.get('manufacturer', explicit_conn.get('manufacturer', '')),
                             )
                         
-                        if bg_result.get('switched_from'):
-                            OutputHelper.print_panel(
-                                f"Auto-disconnected [yellow]{bg_result['switched_from']}[/yellow] (same board)",
-                                title="Connection Switched",
-                                border_style="neutral"
-                            )
-                        
                         if not env_path:
                             vscode_dir = _find_or_create_vscode_dir()
                             env_path = os.path.join(vscode_dir, '.replx')
@@ -406,10 +395,13 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
                     except Exception as e:
                         _handle_connection_error(e, port=port_arg)
                         raise typer.Exit(1)
+                    
+                    # session_setup already reports the new connection's device fields.
+                    status = bg_result
+                    status_fresh = True
         
-        if explicit_port:
-            with AgentClient(port=agent_port, device_port=explicit_port) as client:
-                status = client.send_command('status')
+        if explicit_port and not status_fresh:
+            status = client.send_command('status', port=explicit_port)
         
         STATE.core = status.get('core', STATE.core)
         STATE.device = status.get('device', STATE.device)
@@ -439,6 +431,8 @@ def _ensure_connected(ctx: typer.Context = None) -> dict:
         else:
             OutputHelper.print_panel(f"Agent error: {str(e)}", title="Error", border_style="error")
         raise typer.Exit(1)
+    finally:
+        client.disconnect()
 
 
 _cached_agent_port: Optional[int] = None
@@ -470,6 +464,7 @@ def _create_agent_client() -> AgentClient:
 __all__ = [
     '_handle_connection_error',
     '_ensure_connected',
+    '_invalidate_ensured',
     '_get_current_agent_port',
     '_get_device_port',
     '_create_agent_client',
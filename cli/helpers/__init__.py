@@ -2,26 +2,29 @@ from rich.box import DOUBLE, HEAVY, HORIZONTALS, MINIMAL, ROUNDED, SQUARE
 
 CONSOLE_WIDTH = 100
 
-_panel_box_cache: str | None = None
+_BOX_STYLES = {
+    'rounded': ROUNDED,
+    'horizontals': HORIZONTALS,
+    'square': SQUARE,
+    'heavy': HEAVY,
+    'double': DOUBLE,
+    'minimal': MINIMAL,
+}
+
+_panel_box_cache = None
 
 
 def get_panel_box():
     global _panel_box_cache
-    if _panel_box_cache is None:
+    box = _panel_box_cache
+    if box is None:
         try:
             from replx.cli.config import AgentPortManager
-            _panel_box_cache = AgentPortManager.read_panel_box()
+            style = AgentPortManager.read_panel_box()
         except Exception:
-            _panel_box_cache = 'rounded'
-    box_styles = {
-        'rounded': ROUNDED,
-        'horizontals': HORIZONTALS,
-        'square': SQUARE,
-        'heavy': HEAVY,
-        'double': DOUBLE,
-        'minimal': MINIMAL,
-    }
-    return box_styles.get(_panel_box_cache, ROUNDED)
+            style = 'rounded'
+        box = _panel_box_cache = _BOX_STYLES.get(style, ROUNDED)
+    return box
 
 
 def invalidate_panel_box_cache():
@@ -30,27 +33,25 @@ def invalidate_panel_box_cache():
 
 
 import threading
-_core = ""
-_device = ""
-_version = "?"
-_device_root_fs = "/"
-_device_path = ""
+# (core, device, version, device_root_fs, device_path); replaced as a whole so readers need no lock
+_global_context = ("", "", "?", "/", "")
+_global_context_generation = 0
 _global_context_lock = threading.Lock()
 
 
 def set_global_context(core: str, device: str, version: str, device_root_fs: str, device_path: str):
-    global _core, _device, _version, _device_root_fs, _device_path
+    global _global_context, _global_context_generation
     with _global_context_lock:
-        _core = core
-        _device = device
-        _version = version
-        _device_root_fs = device_root_fs
-        _device_path = device_path
+        _global_context = (core, device, version, device_root_fs, device_path)
+        _global_context_generation += 1
 
 
 def get_global_context():
-    with _global_context_lock:
-        return _core, _device, _version, _device_root_fs, _device_path
+    return _global_context
+
+
+def get_global_context_generation() -> int:
+    return _global_context_generation
 
 
 from .output import OutputHelper, VALID_PANEL_CATEGORIES
@@ -61,7 +62,7 @@ from replx.utils import (
 
 __all__ = [
     'CONSOLE_WIDTH', 'get_panel_box', 'invalidate_panel_box_cache',
-    'set_global_context', 'get_global_context',
+    'set_global_context', 'get_global_context', 'get_global_context_generation',
     'OutputHelper', 'VALID_PANEL_CATEGORIES',
     'DeviceScanner',
     'parse_device_banner', 'get_root_fs_for_core',
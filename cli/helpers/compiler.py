@@ -1,19 +1,112 @@
 import os
+import json
+import atexit
 import hashlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import typer
 
-from . import get_global_context
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from . import get_global_context, get_global_context_generation
 from .store import StoreManager
 from replx.utils.exceptions import CompilationError, ValidationError
 
 
+_COMPILE_CACHE_FORMAT = 2
+_ONE_SHOT_HASH_LIMIT = 4 * 1024 * 1024
+
+_MARCH_BY_CORE = {
+    "ESP32": "xtensa",
+    "ESP32S2": "xtensa",
+    "ESP32S3": "xtensawin",
+    "RP2350": "armv7emsp",
+}
+_MARCH_PREFIXES = (
+    ("ESP32C", "rv32imc"),
+    ("ESP32P", "rv32imc"),
+)
+
+
+@lru_cache(maxsize=16)
+def _normalize_core(core: str) -> str:
+    return core.split("/", 1)[0]
+
+
 class CompilerHelper:
+    # (abs_py, arch_tag) -> (source (mtime_ns, size, ino), content hash, out_mpy, out_mpy (mtime_ns, size, ino), mpy-cross args)
     _compile_cache = {}
+    _cache_loaded = False
+    _cache_dirty = False
+    # (context generation, context tuple, arch tag); rebuilt only after set_global_context
+    _context_snapshot = None
 
     @staticmethod
-    def _run_mpy_cross(args: list[str], source_path: str) -> None:
+    def _cache_path() -> str:
+        return str(StoreManager.HOME_STAGING / ".compile_cache.json")
+
+    @staticmethod
+    def _cache_tag() -> str:
+        # Entries are only valid for the same hash function and mpy-cross build.
+        try:
+            from importlib.metadata import version
+            mpy_cross_version = version("mpy-cross")
+        except Exception:
+            mpy_cross_version = "?"
+        hash_name = "xxh3_128" if xxhash is not None else "blake2b"
+        return f"{_COMPILE_CACHE_FORMAT}:{hash_name}:{mpy_cross_version}"
+
+    @staticmethod
+    def _load_cache() -> None:
+        if CompilerHelper._cache_loaded:
+            return
+        CompilerHelper._cache_loaded = True
+        atexit.register(CompilerHelper._save_cache)
+
+        try:
+            with open(CompilerHelper._cache_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("tag") != CompilerHelper._cache_tag():
+                return
+            for key, (sig, content_hash, out_mpy, out_sig, arch_args) in data.get("entries", {}).items():
+                abs_py, _, arch_tag = key.rpartition("|")
+                CompilerHelper._compile_cache.setdefault(
+                    (abs_py, arch_tag), (tuple(sig), content_hash, out_mpy, tuple(out_sig), tuple(arch_args))
+                )
+        except Exception:
+            pass
+
+    @staticmethod
+    def _save_cache() -> None:
+        if not CompilerHelper._cache_dirty:
+            return
+
+        path = CompilerHelper._cache_path()
+        tmp = path + ".tmp"
+        data = {
+            "tag": CompilerHelper._cache_tag(),
+            "entries": {
+                f"{abs_py}|{arch_tag}": [list(sig), content_hash, out_mpy, list(out_sig), list(arch_args)]
+                for (abs_py, arch_tag), (sig, content_hash, out_mpy, out_sig, arch_args)
+                in list(CompilerHelper._compile_cache.items())
+            },
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+            CompilerHelper._cache_dirty = False
+        except Exception:
+            pass
+
+    @staticmethod
+    def _run_mpy_cross(args: tuple[str, ...], source_path: str) -> None:
         try:
             import mpy_cross
         except ImportError as e:
@@ -44,7 +137,7 @@ class CompilerHelper:
             raise CompilationError(f"MPY compilation failed for {source_path}: {details}")
 
     @staticmethod
-    def compile_file(abs_py: str, out_mpy: str, core: str, version: str) -> str:
+    def compile_file(abs_py: str, out_mpy: str, core: str, version: str, arch_args: tuple[str, ...] | None = None) -> str:
         if not os.path.exists(abs_py):
             raise ValidationError(f"Source file not found: {abs_py}")
 
@@ -52,100 +145,166 @@ class CompilerHelper:
         if out_dir:
             os.makedirs(out_dir, exist_ok=True)
 
-        args = [abs_py, '-o', out_mpy]
-        args.extend(CompilerHelper._march_for_core(core, version or "1.24.0"))
-        CompilerHelper._run_mpy_cross(args, abs_py)
+        if arch_args is None:
+            arch_args = CompilerHelper._march_for_core(core, version or "1.24.0")
+        CompilerHelper._run_mpy_cross((abs_py, '-o', out_mpy, *arch_args), abs_py)
 
-        if os.path.exists(out_mpy) and os.path.getsize(out_mpy) > 0:
+        if CompilerHelper._is_built(out_mpy):
             return out_mpy
 
         raise CompilationError(f"Compilation failed: {out_mpy} not found or empty")
     
+    @staticmethod
+    def _context() -> tuple:
+        generation = get_global_context_generation()
+        snapshot = CompilerHelper._context_snapshot
+        if snapshot is None or snapshot[0] != generation:
+            context = get_global_context()
+            arch_tag = _normalize_core(context[0]) if context[0] else "unknown"
+            snapshot = (generation, context, arch_tag)
+            CompilerHelper._context_snapshot = snapshot
+        return snapshot
+    
     @staticmethod
     def mpy_arch_tag() -> str:
-        _core, _device, _version, _device_root_fs, _device_path = get_global_context()
-        if not _core:
-            return "unknown"
-        if "/" in _core:
-            return _core.split("/", 1)[0]
-        return _core
+        return CompilerHelper._context()[2]
     
     @staticmethod
-    def staging_out_for(abs_py: str, base: str, arch_tag: str) -> str:
+    def _staging_path(abs_py: str, base: str, arch_tag: str):
         rel = os.path.relpath(abs_py, base).replace("\\", "/")
         rel_mpy = os.path.splitext(rel)[0] + ".mpy"
-        out_path = StoreManager.HOME_STAGING / arch_tag / rel_mpy
+        return StoreManager.HOME_STAGING / arch_tag / rel_mpy
+    
+    @staticmethod
+    def staging_out_for(abs_py: str, base: str, arch_tag: str) -> str:
+        out_path = CompilerHelper._staging_path(abs_py, base, arch_tag)
         out_path.parent.mkdir(parents=True, exist_ok=True)
         return str(out_path)
     
     @staticmethod
-    def _compute_file_hash(filepath: str) -> str:
-        hash_md5 = hashlib.md5()
+    def _is_built(out_mpy: str) -> bool:
+        try:
+            return os.stat(out_mpy).st_size > 0
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _output_sig(out_mpy: str) -> tuple[int, int, int] | None:
+        try:
+            st = os.stat(out_mpy)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino) if st.st_size > 0 else None
+    
+    @staticmethod
+    def _compute_file_hash(filepath: str, size: int | None = None) -> str:
+        # Only a local change check, so a fast non-cryptographic hash is enough when available.
+        if size is not None and size < _ONE_SHOT_HASH_LIMIT:
+            with open(filepath, "rb") as f:
+                data = f.read()
+            if xxhash is not None:
+                return xxhash.xxh3_128_hexdigest(data)
+            return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+        h = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
 
     @staticmethod
-    def _march_for_core(core: str, version: str) -> list[str]:
+    @lru_cache(maxsize=16)
+    def _march_for_core(core: str, version: str) -> tuple[str, ...]:
         if not core:
             raise typer.BadParameter("The core is unknown")
 
-        if "/" in core:
-            core = core.split("/", 1)[0]
-
+        core = _normalize_core(core)
         args: list[str] = ['-msmall-int-bits=31']
 
         if core == "EFR32MG":
+            parts = version.split('.') if version else []
             try:
-                ver_parts = version.split('.')
-                ver_float = float(f"{ver_parts[0]}.{ver_parts[1]}" if len(ver_parts) >= 2 else version)
+                ver = (int(parts[0]), int(parts[1]) if len(parts) > 1 else 0)
             except (ValueError, IndexError):
-                ver_float = 0.0
-            if ver_float < 1.19:
+                ver = (0, 0)
+            if ver < (1, 19):
                 args.append('-mno-unicode')
-            return args
+            return tuple(args)
 
-        if core in ("ESP32", "ESP32S2"):
-            args.append('-march=xtensa')
-            return args
+        march = _MARCH_BY_CORE.get(core) or next(
+            (value for prefix, value in _MARCH_PREFIXES if core.startswith(prefix)), None
+        )
+        if march is None:
+            raise typer.BadParameter(f"The {core} is not supported")
+        args.append(f'-march={march}')
+        return tuple(args)
+    
+    @staticmethod
+    def _try_cache_hit(abs_py: str, arch_tag: str, st: os.stat_result, out_mpy: str,
+                       arch_args: tuple[str, ...]) -> tuple[str | None, str | None]:
+        """Return (cached out_mpy or None, content hash if one had to be computed)."""
+        cached = CompilerHelper._compile_cache.get((abs_py, arch_tag))
+        if cached is None:
+            return None, None
 
-        if core == "ESP32S3":
-            args.append('-march=xtensawin')
-            return args
+        cached_sig, cached_hash, cached_out, cached_out_sig, cached_args = cached
+        # Different sources can share a staging path (e.g. <arch>/main.mpy), so the output must still be
+        # the exact file this entry wrote, built with the same mpy-cross flags.
+        if cached_out != out_mpy or cached_args != arch_args:
+            return None, None
+        if CompilerHelper._output_sig(cached_out) != cached_out_sig:
+            return None, None
 
-        if core.startswith("ESP32C"):
-            args.append('-march=rv32imc')
-            return args
+        stat_sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        # Untouched source: trust the previous build without reading the file.
+        if cached_sig == stat_sig:
+            return cached_out, cached_hash
 
-        if core.startswith("ESP32P"):
-            args.append('-march=rv32imc')
-            return args
+        current_hash = CompilerHelper._compute_file_hash(abs_py, st.st_size)
+        if cached_hash != current_hash:
+            return None, current_hash
 
-        if core == "RP2350":
-            args.append('-march=armv7emsp')
-            return args
+        CompilerHelper._compile_cache[(abs_py, arch_tag)] = (stat_sig, current_hash, cached_out, cached_out_sig, cached_args)
+        CompilerHelper._cache_dirty = True
+        return cached_out, current_hash
 
-        raise typer.BadParameter(f"The {core} is not supported")
-    
     @staticmethod
     def compile_to_staging(abs_py: str, base: str) -> str:
-        _core, _device, _version, _device_root_fs, _device_path = get_global_context()
+        _generation, (_core, _device, _version, _device_root_fs, _device_path), arch_tag = CompilerHelper._context()
         
-        if not os.path.exists(abs_py):
+        try:
+            st = os.stat(abs_py)
+        except FileNotFoundError:
             raise ValidationError(f"Source file not found: {abs_py}")
         
-        arch_tag = CompilerHelper.mpy_arch_tag()
-        out_mpy = CompilerHelper.staging_out_for(abs_py, base, arch_tag)
-        
-        cache_key = (abs_py, arch_tag)
-        current_hash = CompilerHelper._compute_file_hash(abs_py)
-        
-        if cache_key in CompilerHelper._compile_cache:
-            cached_hash, cached_out = CompilerHelper._compile_cache[cache_key]
-            if cached_hash == current_hash and os.path.exists(cached_out) and os.path.getsize(cached_out) > 0:
-                return cached_out
+        CompilerHelper._load_cache()
+        arch_args = CompilerHelper._march_for_core(_core, _version or "1.24.0")
+        out_mpy = str(CompilerHelper._staging_path(abs_py, base, arch_tag))
+        hit, current_hash = CompilerHelper._try_cache_hit(abs_py, arch_tag, st, out_mpy, arch_args)
+        if hit is not None:
+            return hit
 
-        CompilerHelper.compile_file(abs_py, out_mpy, _core, _version or "1.24.0")
-        CompilerHelper._compile_cache[cache_key] = (current_hash, out_mpy)
+        if current_hash is None:
+            current_hash = CompilerHelper._compute_file_hash(abs_py, st.st_size)
+        out_mpy = CompilerHelper.staging_out_for(abs_py, base, arch_tag)
+        CompilerHelper.compile_file(abs_py, out_mpy, _core, _version or "1.24.0", arch_args)
+        out_sig = CompilerHelper._output_sig(out_mpy)
+        CompilerHelper._compile_cache[(abs_py, arch_tag)] = (
+            (st.st_mtime_ns, st.st_size, st.st_ino), current_hash, out_mpy, out_sig, arch_args
+        )
+        CompilerHelper._cache_dirty = True
         return out_mpy
+
+    @staticmethod
+    def compile_many_to_staging(items: list[tuple[str, str]]) -> list[str]:
+        if len(items) <= 1:
+            return [CompilerHelper.compile_to_staging(abs_py, base) for abs_py, base in items]
+
+        CompilerHelper._load_cache()
+        # mpy-cross runs as a separate process per file, so threads are enough to keep every core busy.
+        workers = min(len(items), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            out_mpys = list(executor.map(lambda item: CompilerHelper.compile_to_staging(*item), items))
+        # Persist the batch now so an interrupted upload does not cost the next run a full rehash.
+        CompilerHelper._save_cache()
+        return out_mpys
@@ -1,24 +1,31 @@
 import os
 
+from replx.cli.config import ConfigManager
+
+# Parsed KEY=value pairs per .replx path, for the life of the process.
+_env_cache: dict[str, dict[str, str]] = {}
+
 
 class EnvironmentManager:
-    
+
     @staticmethod
     def load_env_from_rep():
-        current_path = os.getcwd()
+        env_path = ConfigManager.find_env_file()
+        if env_path is None:
+            return
 
-        while True:
-            min_path = os.path.join(current_path, ".vscode", ".replx")
-            if os.path.isfile(min_path):
-                with open(min_path, "r", encoding="utf-8") as f:
+        parsed = _env_cache.get(env_path)
+        if parsed is None:
+            parsed = {}
+            try:
+                with open(env_path, "r", encoding="utf-8") as f:
                     for line in f:
-                        line = line.strip()
-                        if line and not line.startswith("#") and "=" in line:
-                            key, value = line.split("=", 1)
-                            os.environ[key.strip()] = value.strip()
+                        key, sep, value = line.partition("=")
+                        key = key.strip()
+                        if sep and key and not key.startswith("#"):
+                            parsed[key] = value.strip()
+            except OSError:
                 return
-            
-            parent_path = os.path.dirname(current_path)
-            if parent_path == current_path:
-                return
-            current_path = parent_path
+            _env_cache[env_path] = parsed
+
+        os.environ.update(parsed)
@@ -3,16 +3,25 @@ import sys
 import re
 import json
 import subprocess
+from dataclasses import dataclass, field
 from functools import lru_cache
 
 from rich.console import Console
 from rich.panel import Panel
+from rich.text import Text
 from rich.theme import Theme
 
+from replx.terminal import IS_WINDOWS
 from ..config import AgentPortManager
 from . import get_panel_box, CONSOLE_WIDTH, get_global_context
 
 
+_RE_TB_FILE = re.compile(r'File "([^"]+)"')
+_RE_TB_LINE = re.compile(r"line (\d+)")
+_RE_BUSY_REPL = re.compile(r'Connection (\S+) is busy.*REPL session is active')
+_RE_BUSY_DETACHED = re.compile(r'Connection (\S+) is busy.*detached script is running')
+_RE_BUSY_COMMAND = re.compile(r'Connection (\S+) is busy.*Another command \((\w+)\)')
+
 _THEME_ALIASES = {
     'dark': 'one-dark-pro',
     'light': 'atom-one-light',
@@ -128,7 +137,7 @@ def _get_portable_vscode_root_from_pshome() -> str | None:
                 'timeout': 2,
                 'check': False,
             }
-            if sys.platform.startswith('win'):
+            if IS_WINDOWS:
                 startupinfo = subprocess.STARTUPINFO()
                 startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
                 startupinfo.wShowWindow = 0
@@ -404,8 +413,50 @@ def _build_rich_theme(name: str) -> Theme:
     return Theme(styles)
 
 
+@dataclass(slots=True)
+class ProgressState:
+    total: int
+    title: str = "Progress"
+    panel_width: int = CONSOLE_WIDTH
+    bar_length: int = field(init=False)
+    _pad: str = field(init=False, repr=False)
+    _fill: str = field(init=False, repr=False)
+    _last_key: tuple | None = field(default=None, init=False, repr=False)
+    _last_panel: Panel | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.bar_length = max(20, self.panel_width - 40)
+        self._pad = "░" * self.bar_length
+        self._fill = "█" * self.bar_length
+
+    def render(self, current: int, message: str = "", counter_text: str = None) -> Panel:
+        total = self.total
+        pct = 0 if total == 0 else min(1.0, current / total)
+        block = min(self.bar_length, int(round(self.bar_length * pct)))
+        percent = int(pct * 100)
+
+        if counter_text is None:
+            counter_text = f"({current}/{total})"
+
+        # Progress callbacks fire far more often than the bar visibly moves; reuse the last panel if nothing changed.
+        key = (block, percent, counter_text, message)
+        if key == self._last_key:
+            return self._last_panel
+
+        bar = self._fill[:block] + self._pad[block:]
+        line = f"[{bar}] {percent}% {counter_text}"
+        panel = Panel(f"{message}\n{line}" if message else line, title=self.title, title_align="left",
+                      border_style=OutputHelper._resolve_category_color('success'),
+                      box=get_panel_box(), expand=True, width=self.panel_width)
+        self._last_key = key
+        self._last_panel = panel
+        return panel
+
+
 class OutputHelper:
-    if hasattr(sys.stdout, 'reconfigure'):
+    if hasattr(sys.stdout, 'reconfigure') and (
+        (sys.stdout.encoding or '').lower() != 'utf-8' or sys.stdout.errors != 'replace'
+    ):
         sys.stdout.reconfigure(encoding='utf-8', errors='replace')
     
     _theme_name = 'one-dark-pro'
@@ -413,6 +464,7 @@ class OutputHelper:
     _theme_styles = dict(_THEME_STYLES[_theme_name])
     _console = Console(width=CONSOLE_WIDTH, legacy_windows=False, theme=Theme(_theme_styles))
     PANEL_WIDTH = None
+    _progress_state: ProgressState | None = None
 
     @staticmethod
     def make_console(width: int = CONSOLE_WIDTH, file=None, **kwargs) -> Console:
@@ -473,7 +525,7 @@ class OutputHelper:
         if port is None:
             return ""
         p = str(port).strip()
-        return p.upper() if sys.platform.startswith("win") else p
+        return p.upper() if IS_WINDOWS else p
     
     @staticmethod
     def _get_panel_width():
@@ -483,22 +535,29 @@ class OutputHelper:
     
     @staticmethod
     def print_panel(
-        content: str,
+        content: str | Text,
         title: str = "",
         border_style: str = "data",
         *,
         height: int | None = None,
         **panel_kwargs,
     ):
-        width = OutputHelper._get_panel_width()
-        panel_kwargs["title_align"] = "left"
-
-        # Resolve category → color key → theme hex, with per-category user override
         if border_style not in _CATEGORY_COLOR_KEYS:
             raise ValueError(
                 f"Unknown panel category: {border_style!r}. "
                 f"Valid: {', '.join(_CATEGORY_COLOR_KEYS)}"
             )
+
+        if isinstance(content, (str, Text)) and not OutputHelper._console.is_terminal:
+            # Not interactive: skip the Panel renderable and emit plain text
+            plain = content.plain if isinstance(content, Text) else Text.from_markup(content).plain
+            print(f"{title}\n{plain}" if title else plain, flush=True)
+            return
+
+        width = OutputHelper._get_panel_width()
+        panel_kwargs["title_align"] = "left"
+
+        # Resolve category → color key → theme hex, with per-category user override
         color_key = _CATEGORY_COLOR_KEYS[border_style]
         panel_colors = AgentPortManager.read_panel_colors()
         if border_style in panel_colors:
@@ -528,29 +587,19 @@ class OutputHelper:
             return panel_colors[category]
         return OutputHelper._theme_styles[color_key]
 
+    @staticmethod
+    def live_context(renderable=None, **live_kwargs):
+        from rich.live import Live
+        live_kwargs.setdefault('refresh_per_second', 10)
+        return Live(renderable if renderable is not None else Text(""), console=OutputHelper._console, **live_kwargs)
+
     @staticmethod
     def create_progress_panel(current: int, total: int, title: str = "Progress", message: str = "", counter_text: str = None):
-        pct = 0 if total == 0 else min(1.0, current / total)
-        
         panel_width = OutputHelper._get_panel_width()
-        bar_length = max(20, panel_width - 40) 
-        
-        block = min(bar_length, int(round(bar_length * pct)))
-        bar = "█" * block + "░" * (bar_length - block)
-        percent = int(pct * 100)
-        
-        if counter_text is None:
-            counter_text = f"({current}/{total})"
-        
-        content_lines = []
-        if message:
-            content_lines.append(message)
-        content_lines.append(f"[{bar}] {percent}% {counter_text}")
-        
-        width = OutputHelper._get_panel_width()
-        return Panel("\n".join(content_lines), title=title, title_align="left",
-                     border_style=OutputHelper._resolve_category_color('success'),
-                     box=get_panel_box(), expand=True, width=width)
+        state = OutputHelper._progress_state
+        if state is None or state.total != total or state.title != title or state.panel_width != panel_width:
+            state = OutputHelper._progress_state = ProgressState(total, title, panel_width)
+        return state.render(current, message, counter_text)
 
     @staticmethod
     def create_spinner_panel(message: str, title: str = "Processing", spinner_frames: list = None, frame_idx: int = 0):
@@ -582,12 +631,12 @@ class OutputHelper:
                 full_path = os.path.abspath(os.path.join(os.getcwd(), local_file))
                 err_line = err_line_raw.replace("<stdin>", full_path, 1)
             else:
-                match = re.search(r'File "([^"]+)"', err_line_raw)
+                match = _RE_TB_FILE.search(err_line_raw)
                 if match:
                     device_src_path = os.path.join(_device_path, "src")
                     full_path = os.path.join(device_src_path, match.group(1))
-                    escaped_filename = re.sub(r"([\\\\])", r"\\\1", full_path)
-                    err_line = re.sub(r'File "([^"]+)"', rf'File "{escaped_filename}"', err_line_raw)
+                    # A callable replacement is inserted verbatim, so backslashes in the path need no escaping.
+                    err_line = _RE_TB_FILE.sub(lambda _m: f'File "{full_path}"', err_line_raw)
                 else:
                     full_path = os.path.abspath(os.path.join(os.getcwd(), local_file))
                     err_line = err_line_raw
@@ -596,7 +645,7 @@ class OutputHelper:
             
             err_content = out[-1].strip()
 
-            match = re.search(r"line (\d+)", err_line)
+            match = _RE_TB_LINE.search(err_line)
             if match:
                 line = int(match.group(1))
                 try:
@@ -616,7 +665,7 @@ class OutputHelper:
         error_msg = str(error)
         
         if 'is busy' in error_msg:
-            repl_match = re.search(r'Connection (\S+) is busy.*REPL session is active', error_msg)
+            repl_match = _RE_BUSY_REPL.search(error_msg)
             if repl_match:
                 port = repl_match.group(1)
                 message = (
@@ -631,7 +680,7 @@ class OutputHelper:
                 )
                 return True
             
-            detached_match = re.search(r'Connection (\S+) is busy.*detached script is running', error_msg)
+            detached_match = _RE_BUSY_DETACHED.search(error_msg)
             if detached_match:
                 port = detached_match.group(1)
                 message = (
@@ -646,7 +695,7 @@ class OutputHelper:
                 )
                 return True
             
-            match = re.search(r'Connection (\S+) is busy.*Another command \((\w+)\)', error_msg)
+            match = _RE_BUSY_COMMAND.search(error_msg)
             if match:
                 port = match.group(1)
                 command = match.group(2)
@@ -1,4 +1,7 @@
 import os
+import shutil
+import threading
+from dataclasses import dataclass
 from typing import Optional, Tuple
 from urllib.parse import urlparse
 
@@ -11,6 +14,15 @@ from .store import StoreManager
 from ..agent.client import AgentClient
 
 
+_DOWNLOAD_CHUNK = 128 * 1024
+_RAW_HOST = "raw.githubusercontent.com"
+
+# One keep-alive HTTPS connection per download worker thread; all are tracked so a batch can close them
+_raw_conn_local = threading.local()
+_raw_conns: list = []
+_raw_conns_lock = threading.Lock()
+
+
 class InstallHelper:
     
     @staticmethod
@@ -53,29 +65,89 @@ class InstallHelper:
             f"Invalid spec: {spec} (expect core.all/device.all/core.<file>/device.<file>)"
         )
     
+    @staticmethod
+    def _raw_get(url_path: str, headers: dict):
+        import http.client
+        # A pooled connection may have been closed by the server since its last use; reconnect once.
+        for attempt in range(2):
+            conn = getattr(_raw_conn_local, "conn", None)
+            if conn is None:
+                conn = http.client.HTTPSConnection(_RAW_HOST, timeout=HTTP_REQUEST_TIMEOUT)
+                _raw_conn_local.conn = conn
+                with _raw_conns_lock:
+                    _raw_conns.append(conn)
+            try:
+                conn.request("GET", url_path, headers=headers)
+                return conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                _raw_conn_local.conn = None
+                with _raw_conns_lock:
+                    if conn in _raw_conns:
+                        _raw_conns.remove(conn)
+                if attempt:
+                    raise
+
+    @staticmethod
+    def close_raw_connections() -> None:
+        with _raw_conns_lock:
+            conns = list(_raw_conns)
+            _raw_conns.clear()
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _urllib_download(url: str, headers: dict, out_path: str) -> str:
+        import urllib.request
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=HTTP_REQUEST_TIMEOUT) as r, \
+                open(out_path, "wb", buffering=_DOWNLOAD_CHUNK) as f:
+            shutil.copyfileobj(r, f, length=_DOWNLOAD_CHUNK)
+        return out_path
+
     @staticmethod
     def download_raw_file(owner: str, repo: str, ref_: str, path: str, out_path: str) -> str:
         import urllib.request
-        url = f"https://raw.githubusercontent.com/{owner}/{repo}/{ref_}/{path}"
-        req = urllib.request.Request(url, headers=StoreManager.gh_headers())
+        url_path = f"/{owner}/{repo}/{ref_}/{path}"
+        url = f"https://{_RAW_HOST}{url_path}"
+        headers = StoreManager.gh_headers()
         os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        with urllib.request.urlopen(req, timeout=HTTP_REQUEST_TIMEOUT) as r, open(out_path, "wb") as f:
-            f.write(r.read())
+        # The pooled connection talks to GitHub directly; keep urllib's proxy handling when one is configured.
+        if "https" in urllib.request.getproxies() and not urllib.request.proxy_bypass(_RAW_HOST):
+            return InstallHelper._urllib_download(url, headers, out_path)
+        r = InstallHelper._raw_get(url_path, headers)
+        try:
+            if r.status != 200:
+                r.read()
+                # Redirects and errors are rare; let urllib follow them or raise the usual HTTPError.
+                return InstallHelper._urllib_download(url, headers, out_path)
+            with open(out_path, "wb", buffering=_DOWNLOAD_CHUNK) as f:
+                shutil.copyfileobj(r, f, length=_DOWNLOAD_CHUNK)
+        except BaseException:
+            # A partially read body leaves the connection unusable for the next request.
+            conn = getattr(_raw_conn_local, "conn", None)
+            if conn is not None and not r.isclosed():
+                conn.close()
+                _raw_conn_local.conn = None
+            raise
         return out_path
     
     @staticmethod
     def ensure_remote_dir(remote_dir: str, client: AgentClient = None):
         if not remote_dir:
             return
-        client = client or AgentClient()
         parts = [p for p in remote_dir.replace("\\", "/").strip("/").split("/") if p]
-        path = "/"
-        for p in parts:
-            path = path + p + "/"
-            try:
-                client.send_command('mkdir', path=path.rstrip('/'))
-            except Exception:
-                pass
+        if not parts:
+            return
+        client = client or AgentClient()
+        # The device-side mkdir already creates missing parents, so one round trip covers the whole path.
+        try:
+            client.send_command('mkdir', path="/" + "/".join(parts))
+        except Exception:
+            pass
     
     @staticmethod
     def remote_dir_for(scope: str, rel_dir: str) -> str:
@@ -135,6 +207,26 @@ class InstallHelper:
         return True, "ok"
 
 
+# id(items) -> (items, len(items), {lowercased key: original key}); holding items keeps the id from being reused
+_ci_index_cache: dict[int, tuple[set | dict, int, dict[str, str]]] = {}
+
+
+def _ci_index(items: set | dict) -> dict[str, str]:
+    entry = _ci_index_cache.get(id(items))
+    if entry is not None and entry[0] is items and entry[1] == len(items):
+        return entry[2]
+
+    index = {}
+    for k in items:
+        if isinstance(k, str):
+            index.setdefault(k.lower(), k)
+
+    if len(_ci_index_cache) >= 8:
+        _ci_index_cache.clear()
+    _ci_index_cache[id(items)] = (items, len(items), index)
+    return index
+
+
 class SearchHelper:
     
     @staticmethod
@@ -144,32 +236,80 @@ class SearchHelper:
     
     @staticmethod
     def key_ci(items: set | dict, name: str) -> Optional[str]:
-        if not name:
-            return None
-        
-        if isinstance(items, set):
-            if name in items:
-                return name
-            n = name.lower()
-            for k in items:
-                if isinstance(k, str) and k.lower() == n:
-                    return k
-            return None
-        
-        if isinstance(items, dict):
-            if name in items:
-                return name
-            n = name.lower()
-            for k in items.keys():
-                if isinstance(k, str) and k.lower() == n:
-                    return k
+        if not name or not isinstance(items, (set, dict)):
             return None
         
-        return None
+        if name in items:
+            return name
+        return _ci_index(items).get(name.lower())
+
+
+@dataclass(slots=True)
+class RegistryIndex:
+    packages: dict
+    size: int
+    core_packages: list[tuple[str, dict]]
+    # Packages walk_files_for_device can yield from: any with variants, plus device-* types
+    device_packages: list[tuple[str, dict]]
+    # source -> first package whose own source matches
+    by_source: dict[str, tuple[str, dict]]
+    # source -> first (name, meta, from_variant) in package order, checking each package before its variants
+    by_any_source: dict[str, tuple[str, dict, bool]]
+
+
+# id(reg) -> (reg, RegistryIndex); holding reg keeps the id from being reused
+_registry_index_cache: dict[int, tuple[dict, RegistryIndex]] = {}
 
 
 class RegistryHelper:
     
+    @staticmethod
+    def _build_index(reg: dict) -> RegistryIndex:
+        packages = reg.get("packages", {})
+        entry = _registry_index_cache.get(id(reg))
+        if entry is not None and entry[0] is reg:
+            index = entry[1]
+            if index.packages is packages and index.size == len(packages):
+                return index
+
+        core_packages = []
+        device_packages = []
+        by_source = {}
+        by_any_source = {}
+        for name, meta in packages.items():
+            pkg_type = meta.get("type", "")
+            if pkg_type == "core":
+                core_packages.append((name, meta))
+            variants = meta.get("variants", {})
+            if variants or pkg_type.startswith("device-"):
+                device_packages.append((name, meta))
+
+            source = meta.get("source")
+            if source is not None:
+                by_source.setdefault(source, (name, meta))
+                by_any_source.setdefault(source, (name, meta, False))
+            for var_meta in variants.values():
+                var_source = var_meta.get("source")
+                if var_source is not None:
+                    by_any_source.setdefault(var_source, (name, meta, True))
+
+        index = RegistryIndex(packages, len(packages), core_packages, device_packages, by_source, by_any_source)
+        if len(_registry_index_cache) >= 4:
+            _registry_index_cache.clear()
+        _registry_index_cache[id(reg)] = (reg, index)
+        return index
+    
+    @staticmethod
+    def find_package_by_source(reg: dict, source: str) -> tuple[Optional[str], Optional[dict]]:
+        found = RegistryHelper._build_index(reg).by_any_source.get(source)
+        if found is None:
+            return None, None
+        name, meta, from_variant = found
+        if from_variant:
+            meta = meta.copy()
+            meta["source"] = source
+        return name, meta
+    
     @staticmethod
     def root_sections(reg: dict):
         platform_cores = reg.get("platform_cores", {})
@@ -207,9 +347,32 @@ class RegistryHelper:
                     break
             return pkg_base == pattern or pkg_name == pattern
     
+    @staticmethod
+    def compile_patterns(patterns: list[str]) -> tuple[tuple[str, ...], frozenset[str]]:
+        """Split patterns into (wildcard prefixes, literal names) for match_compiled."""
+        prefixes = tuple(p.rstrip("/*") for p in patterns if "*" in p)
+        exacts = frozenset(p for p in patterns if "*" not in p)
+        return prefixes, exacts
+    
+    @staticmethod
+    def match_compiled(pkg_name: str, compiled: tuple[tuple[str, ...], frozenset[str]]) -> bool:
+        """Same result as match_pattern against any of the compiled patterns."""
+        prefixes, exacts = compiled
+        if prefixes and pkg_name.startswith(prefixes):
+            return True
+        if not exacts:
+            return False
+        if pkg_name in exacts:
+            return True
+        for ext in (".py", ".pyi", ".json"):
+            if pkg_name.endswith(ext):
+                return pkg_name[:-len(ext)] in exacts
+        return False
+    
     @staticmethod
     def get_packages_matching(reg: dict, patterns: list[str], package_type: str = None) -> dict:
         packages = reg.get("packages", {})
+        compiled = RegistryHelper.compile_patterns(patterns)
         result = {}
         
         for pkg_name, pkg_meta in packages.items():
@@ -220,11 +383,8 @@ class RegistryHelper:
                 elif package_type == "device" and not pkg_type.startswith("device-"):
                     continue
             
-            source = pkg_meta.get("source", "")
-            for pattern in patterns:
-                if RegistryHelper.match_pattern(source, pattern):
-                    result[pkg_name] = pkg_meta
-                    break
+            if RegistryHelper.match_compiled(pkg_meta.get("source", ""), compiled):
+                result[pkg_name] = pkg_meta
         
         return result
     
@@ -243,44 +403,36 @@ class RegistryHelper:
     
     @staticmethod
     def effective_version(reg: dict, scope: str, target: str, part: str, relpath: str) -> float:
-        packages = reg.get("packages", {})
-        
         if scope == "core":
             source_path = f"core/{target}/{part}/{relpath}"
         else:
             source_path = f"device/{target}/{part}/{relpath}"
         
-        for pkg_name, pkg_meta in packages.items():
-            pkg_source = pkg_meta.get("source", "")
-            if pkg_source == source_path:
-                return RegistryHelper.get_version(pkg_meta)
+        found = RegistryHelper._build_index(reg).by_source.get(source_path)
+        if found is not None:
+            return RegistryHelper.get_version(found[1])
         
         return 0.0
     
     @staticmethod
     def walk_files_for_core(reg: dict, core_name: str, part: str = "src"):
-        packages = reg.get("packages", {})
-        patterns = RegistryHelper.get_packages_for_platform(reg, core_name)
+        core_packages = RegistryHelper._build_index(reg).core_packages
+        prefixes, exacts = RegistryHelper.compile_patterns(
+            RegistryHelper.get_packages_for_platform(reg, core_name)
+        )
+        # Core wildcards match a whole path segment anywhere in the source, not just a leading prefix.
+        dir_needles = tuple(f"/{prefix}/" for prefix in prefixes)
+        tail_needles = tuple(f"/{prefix}" for prefix in prefixes)
+        literals = ((), exacts)
         
-        for pkg_name, pkg_meta in packages.items():
-            if pkg_meta.get("type") != "core":
-                continue
-            
+        for pkg_name, pkg_meta in core_packages:
             source = pkg_meta.get("source", "")
             
-            match_found = False
-            for pattern in patterns:
-                if "*" in pattern:
-                    pattern_prefix = pattern.rstrip("/*")
-                    if f"/{pattern_prefix}/" in source or source.endswith(f"/{pattern_prefix}"):
-                        match_found = True
-                        break
-                else:
-                    if RegistryHelper.match_pattern(source, pattern):
-                        match_found = True
-                        break
-            
-            if not match_found:
+            if not (
+                (tail_needles and source.endswith(tail_needles))
+                or any(needle in source for needle in dir_needles)
+                or RegistryHelper.match_compiled(source, literals)
+            ):
                 continue
             
             if part == "src":
@@ -299,27 +451,22 @@ class RegistryHelper:
     
     @staticmethod
     def walk_files_for_device(reg: dict, device_name: str, part: str = "src", include_submodules: bool = False):
-        packages = reg.get("packages", {})
+        device_packages = RegistryHelper._build_index(reg).device_packages
         patterns = RegistryHelper.get_packages_for_device(reg, device_name)
+        compiled = RegistryHelper.compile_patterns(patterns)
+        # Patterns naming a directory also match everything below it.
+        dir_prefixes = tuple(pattern + "/" for pattern in patterns if "/" in pattern)
         
-        for pkg_name, pkg_meta in packages.items():
+        def _matches(path: str) -> bool:
+            return RegistryHelper.match_compiled(path, compiled) or bool(dir_prefixes and path.startswith(dir_prefixes))
+        
+        for pkg_name, pkg_meta in device_packages:
             variants = pkg_meta.get("variants", {})
             for variant_name, variant_meta in variants.items():
                 variant_deploy = variant_meta.get("deploy_path", "")
+                module_name = variant_deploy.replace("/__init__.py", "").replace(".py", "")
                 
-                match_found = False
-                for pattern in patterns:
-                    module_name = variant_deploy.replace("/__init__.py", "").replace(".py", "")
-                    variant_full_path = f"{variant_name}/{module_name}"
-                    
-                    if RegistryHelper.match_pattern(variant_full_path, pattern):
-                        match_found = True
-                        break
-                    if "/" in pattern and variant_full_path.startswith(pattern + "/"):
-                        match_found = True
-                        break
-                
-                if not match_found:
+                if not _matches(f"{variant_name}/{module_name}"):
                     continue
                 
                 if part == "src":
@@ -350,42 +497,27 @@ class RegistryHelper:
             deploy_path = pkg_meta.get("deploy_path", "")
             
             match_found = False
-            for pattern in patterns:
-                if "@" in pkg_name:
-                    parts = pkg_name.split("@")
-                    module_name = parts[0]
-                    device_prefix = parts[1]
-                    variant_full_path = f"{device_prefix}/{module_name}"
-                    if RegistryHelper.match_pattern(variant_full_path, pattern):
-                        match_found = True
-                        break
-                
-                if source.startswith("device/"):
-                    source_parts = source.split("/")
-                    if len(source_parts) >= 4:
-                        category = source_parts[1]
-                        file_parts = source_parts[3:]
-                        
-                        file_path = "/".join(file_parts)
-                        if file_path.endswith("/__init__.py"):
-                            file_path = file_path[:-12]
-                        elif file_path.endswith(".py") or file_path.endswith(".pyi"):
-                            file_path = file_path[:-3]
-                        
-                        source_pattern_path = f"{category}/{file_path}"
-                        
-                        if RegistryHelper.match_pattern(source_pattern_path, pattern):
-                            match_found = True
-                            break
-                
-                if RegistryHelper.match_pattern(deploy_path, pattern):
-                    match_found = True
-                    break
-                if "/" in pattern and deploy_path.startswith(pattern + "/"):
-                    match_found = True
-                    break
+            if "@" in pkg_name:
+                parts = pkg_name.split("@")
+                module_name = parts[0]
+                device_prefix = parts[1]
+                match_found = RegistryHelper.match_compiled(f"{device_prefix}/{module_name}", compiled)
+            
+            if not match_found and source.startswith("device/"):
+                source_parts = source.split("/")
+                if len(source_parts) >= 4:
+                    category = source_parts[1]
+                    file_parts = source_parts[3:]
+                    
+                    file_path = "/".join(file_parts)
+                    if file_path.endswith("/__init__.py"):
+                        file_path = file_path[:-12]
+                    elif file_path.endswith(".py") or file_path.endswith(".pyi"):
+                        file_path = file_path[:-3]
+                    
+                    match_found = RegistryHelper.match_compiled(f"{category}/{file_path}", compiled)
             
-            if not match_found:
+            if not match_found and not _matches(deploy_path):
                 continue
             
             if part == "src":
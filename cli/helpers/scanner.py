@@ -101,7 +101,8 @@ class DeviceScanner:
     @staticmethod
     def scan_serial_ports(max_workers: int = 5, exclude_ports: list = None) -> list:
         from serial.tools.list_ports import comports as list_ports_comports
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        import queue
+        import threading
         
         results = []
         
@@ -147,24 +148,44 @@ class DeviceScanner:
         else:
             per_port_timeout = 3.0
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_port = {
-                executor.submit(DeviceScanner.get_board_info_from_banner, port.device): port.device
-                for port in valid_ports
-            }
-            
-            for future in as_completed(future_to_port):
-                port_device = future_to_port[future]
+        pending = queue.SimpleQueue()
+        for port in valid_ports:
+            pending.put(port.device)
+        done = queue.SimpleQueue()
+        
+        def probe():
+            while True:
                 try:
-                    board_info = future.result(timeout=per_port_timeout)
-                    if board_info:
-                        results.append((port_device, board_info))
-                except TimeoutError:
-                    # Port scan timed out
-                    pass
-                except (OSError, IOError):
-                    # Port access error
-                    pass
+                    port_device = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    done.put((port_device, DeviceScanner.get_board_info_from_banner(port_device), None))
+                except Exception as e:
+                    done.put((port_device, None, e))
+        
+        # Daemon threads: a probe stuck in open (e.g. a hung driver) is dropped at the
+        # deadline and cannot keep the interpreter alive at exit either.
+        workers = min(max_workers, len(valid_ports))
+        for _ in range(workers):
+            threading.Thread(target=probe, daemon=True).start()
+        deadline = time.monotonic() + per_port_timeout * -(-len(valid_ports) // workers)
+        
+        for _ in valid_ports:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                port_device, board_info, error = done.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if isinstance(error, (OSError, IOError)):
+                # Port access error
+                continue
+            if error is not None:
+                raise error
+            if board_info:
+                results.append((port_device, board_info))
         
         return results
     
@@ -1,11 +1,18 @@
 import os
 import json
 import base64
+import pickle
 import urllib.request
+from functools import cache
 from pathlib import Path
 
 import typer
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from replx.utils.constants import HTTP_REQUEST_TIMEOUT
 
 
@@ -13,8 +20,12 @@ class StoreManager:
     HOME_STORE = Path.home() / ".replx"
     HOME_STAGING = HOME_STORE / ".staging"
     META_NAME = "registry.json"
+    META_CACHE_NAME = "registry.cache"
+    # "core:<name>:" / "device:<name>:" -> package keys of the last loaded or saved meta.
+    _packages_by_prefix: dict[str, list[str]] = {}
     
     @staticmethod
+    @cache
     def ensure_home_store():
         StoreManager.HOME_STORE.mkdir(parents=True, exist_ok=True)
         (StoreManager.HOME_STORE / "core").mkdir(exist_ok=True)
@@ -22,11 +33,13 @@ class StoreManager:
         StoreManager.HOME_STAGING.mkdir(parents=True, exist_ok=True)
     
     @staticmethod
+    @cache
     def pkg_root() -> str:
         StoreManager.ensure_home_store()
         return str(StoreManager.HOME_STORE)
     
     @staticmethod
+    @cache
     def builtin_typehints_root() -> str:
         import replx
         return os.path.join(os.path.dirname(replx.__file__), "typehints")
@@ -48,9 +61,15 @@ class StoreManager:
         return os.path.join(StoreManager.builtin_typehints_root(), "device", device)
     
     @staticmethod
+    @cache
     def local_meta_path() -> str:
         return os.path.join(StoreManager.pkg_root(), StoreManager.META_NAME)
     
+    @staticmethod
+    @cache
+    def local_meta_cache_path() -> str:
+        return os.path.join(StoreManager.pkg_root(), StoreManager.META_CACHE_NAME)
+    
     @staticmethod
     def gh_headers() -> dict:
         hdrs = {"User-Agent": "replx"}
@@ -62,22 +81,76 @@ class StoreManager:
     @staticmethod
     def load_local_meta() -> dict:
         p = StoreManager.local_meta_path()
-        if not os.path.exists(p):
+        try:
+            meta_mtime = os.stat(p).st_mtime_ns
+        except OSError:
+            StoreManager._packages_by_prefix = {}
             return {"targets": {}, "items": {}}
+        
+        cache = StoreManager.local_meta_cache_path()
+        try:
+            if os.stat(cache).st_mtime_ns >= meta_mtime:
+                with open(cache, "rb") as f:
+                    meta = pickle.load(f)
+                StoreManager._index_packages(meta)
+                return meta
+        except Exception:
+            pass
+        
         try:
             with open(p, "r", encoding="utf-8") as f:
-                return json.load(f)
+                meta = json.load(f)
         except Exception:
+            StoreManager._packages_by_prefix = {}
             return {"targets": {}, "items": {}}
+        
+        StoreManager._write_meta_cache(meta)
+        StoreManager._index_packages(meta)
+        return meta
+    
+    @staticmethod
+    def _index_packages(meta: dict):
+        by_prefix = {}
+        for key in meta.get("packages", {}):
+            scope, _, rest = key.partition(":")
+            name, sep, _ = rest.partition(":")
+            if sep:
+                by_prefix.setdefault(f"{scope}:{name}:", []).append(key)
+        StoreManager._packages_by_prefix = by_prefix
+    
+    @staticmethod
+    def package_keys(prefix: str) -> list[str]:
+        return list(StoreManager._packages_by_prefix.get(prefix, ()))
+    
+    @staticmethod
+    def _write_meta_cache(meta: dict):
+        cache = StoreManager.local_meta_cache_path()
+        tmp = cache + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache)
+        except Exception:
+            pass
     
     @staticmethod
     def save_local_meta(meta: dict):
         p = StoreManager.local_meta_path()
         tmp = p + ".tmp"
         os.makedirs(os.path.dirname(p), exist_ok=True)
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        try:
+            os.remove(StoreManager.local_meta_cache_path())
+        except OSError:
+            pass
+        if orjson is not None:
+            data = orjson.dumps(meta, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")
+        with open(tmp, "wb") as f:
+            f.write(data)
         os.replace(tmp, p)
+        StoreManager._write_meta_cache(meta)
+        StoreManager._index_packages(meta)
     
     @staticmethod
     def load_remote_meta(owner: str, repo: str, ref_: str) -> dict:
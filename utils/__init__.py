@@ -1,8 +1,12 @@
 import re as _re
-import sys as _sys
+from functools import lru_cache as _lru_cache
 from typing import Optional as _Optional
 
+# replx.terminal imports replx.utils.constants, so bind the module and read IS_WINDOWS at call time.
+from replx import terminal as _terminal
 
+
+@_lru_cache(maxsize=64)
 def device_name_to_path(device_name: str) -> str:
     return device_name.replace('-', '_')
 
@@ -18,7 +22,7 @@ def canon_port(port: _Optional[str]) -> _Optional[str]:
     p = str(port).strip()
     if not p:
         return p
-    if _sys.platform == "win32" or _sys.platform.startswith("win"):
+    if _terminal.IS_WINDOWS:
         if _re.match(r"(?i)^com\d+$", p):
             return p.upper()
     return p